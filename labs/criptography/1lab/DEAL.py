@@ -1,34 +1,76 @@
 import os
+import sys
 import binascii
-from enum import Enum
 
-class EncryptionMode(Enum):
-    ECB = 1
-    CBC = 2
-    CFB = 3
-    OFB = 4
-    CTR = 5
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from modes import (BlockCipher, EncryptionMode, KeyScheduleCache, KeystreamGenerator, PARALLEL_THRESHOLD,
+                   StreamDecryptor, StreamEncryptor, decrypt_stream, encrypt_stream)
+
+
+class DESKeySchedule:
+    """Неизменяемое расписание ключей DES: прямой и обратный порядок 48-битных раундовых ключей."""
+    __slots__ = ('key', 'encrypt_keys', 'decrypt_keys')
 
-class DES:
     def __init__(self, key: bytes):
+        round_keys = tuple(_generate_round_keys(key))
+        object.__setattr__(self, 'key', bytes(key))
+        object.__setattr__(self, 'encrypt_keys', round_keys)
+        object.__setattr__(self, 'decrypt_keys', round_keys[::-1])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Расписание ключей неизменяемо.")
+
+
+KEY_SCHEDULE_CACHE = KeyScheduleCache(DESKeySchedule)
+
+
+def _generate_round_keys(key: bytes) -> list[int]:
+    if len(key) != 8:
+        raise ValueError("Длина ключа DES должна быть 64 бита (8 байт).")
+    key_int = int.from_bytes(key, 'big')
+    permuted_key = _permute_int(key_int, PC1, 64)
+    left, right = permuted_key >> 28, permuted_key & 0xFFFFFFF
+    round_keys = []
+
+    for i in range(16):
+        left = ((left << SHIFT_TABLE[i]) | (left >> (28 - SHIFT_TABLE[i]))) & 0xFFFFFFF
+        right = ((right << SHIFT_TABLE[i]) | (right >> (28 - SHIFT_TABLE[i]))) & 0xFFFFFFF
+        round_keys.append(_permute_int((left << 28) | right, PC2, 56))
+
+    return round_keys
+
+
+
+class DES(BlockCipher):
+    block_size = 8
+
+    def __init__(self, key: bytes, workers: int = 1, parallel_threshold: int = PARALLEL_THRESHOLD):
         self.key = key
-        self.round_keys = self._generate_round_keys(key)
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self.schedule = KEY_SCHEDULE_CACHE.get(bytes(key))
+        self.round_keys = self.schedule.encrypt_keys
+        self.decrypt_round_keys = self.schedule.decrypt_keys
 
-    def _generate_round_keys(self, key: bytes) -> list[bytes]:
-        key_bits = self._bytes_to_bits(key)
-        permuted_key = self._permute(key_bits, PC1)
-        left, right = permuted_key[:28], permuted_key[28:]
-        round_keys = []
+    def _encrypt_block_int(self, block: int) -> int:
+        return des_process_block(block, self.round_keys)
 
-        for i in range(16):
-            left = self._left_shift(left, SHIFT_TABLE[i])
-            right = self._left_shift(right, SHIFT_TABLE[i])
-            round_key = self._permute(left + right, PC2)
-            round_keys.append(self._bits_to_bytes(round_key))
+    def _decrypt_block_int(self, block: int) -> int:
+        return des_process_block(block, self.decrypt_round_keys)
 
-        return round_keys
+    def _factory(self) -> tuple:
+        return DES, (bytes(self.key),)
 
-    def _process(self, data: bytes, round_keys: list[bytes]) -> bytes:
+    def _process(self, data: bytes, round_keys: list[int]) -> bytes:
+        if len(data) != 8:
+            raise ValueError("Длина блока данных должна быть 64 бита (8 байт).")
+
+        block = des_process_block(int.from_bytes(data, 'big'), round_keys)
+        return block.to_bytes(8, 'big')
+
+    # Эталонная (строковая) реализация раундов DES, оставлена для сверки и бенчмарков
+    def _process_bits(self, data: bytes, round_keys: list[int]) -> bytes:
         if len(data) != 8:
             raise ValueError("Длина блока данных должна быть 64 бита (8 байт).")
 
@@ -44,9 +86,9 @@ class DES:
         final_block = self._permute(right + left, IP_INV)
         return self._bits_to_bytes(final_block)
 
-    def _f_function(self, right: str, round_key: bytes) -> str:
+    def _f_function(self, right: str, round_key: int) -> str:
         expanded = self._permute(right, E)
-        xored = self._xor_bits(expanded, self._bytes_to_bits(round_key))
+        xored = self._xor_bits(expanded, format(round_key, '048b'))
         substituted = self._s_box_substitution(xored)
         permuted = self._permute(substituted, P)
         return permuted
@@ -63,9 +105,6 @@ class DES:
     def _permute(self, block: str, table: list[int]) -> str:
         return ''.join(block[i - 1] for i in table)
 
-    def _left_shift(self, key: str, n: int) -> str:
-        return key[n:] + key[:n]
-
     def _xor_bits(self, a: str, b: str) -> str:
         return ''.join(str(int(x) ^ int(y)) for x, y in zip(a, b))
 
@@ -75,153 +114,6 @@ class DES:
     def _bits_to_bytes(self, bits: str) -> bytes:
         return bytes(int(bits[i:i+8], 2) for i in range(0, len(bits), 8))
 
-    def encrypt(self, data: bytes, mode: EncryptionMode, iv: bytes = None) -> bytes:
-        if mode == EncryptionMode.ECB:
-            return self._encrypt_ecb(data)
-        elif mode == EncryptionMode.CBC:
-            return self._encrypt_cbc(data, iv)
-        elif mode == EncryptionMode.CFB:
-            return self._encrypt_cfb(data, iv)
-        elif mode == EncryptionMode.OFB:
-            return self._encrypt_ofb(data, iv)
-        elif mode == EncryptionMode.CTR:
-            return self._encrypt_ctr(data, iv)
-        else:
-            raise ValueError("Неподдерживаемый режим шифрования.")
-
-    def decrypt(self, data: bytes, mode: EncryptionMode, iv: bytes = None) -> bytes:
-        if mode == EncryptionMode.ECB:
-            return self._decrypt_ecb(data)
-        elif mode == EncryptionMode.CBC:
-            return self._decrypt_cbc(data, iv)
-        elif mode == EncryptionMode.CFB:
-            return self._decrypt_cfb(data, iv)
-        elif mode == EncryptionMode.OFB:
-            return self._decrypt_ofb(data, iv)
-        elif mode == EncryptionMode.CTR:
-            return self._decrypt_ctr(data, iv)
-        else:
-            raise ValueError("Неподдерживаемый режим шифрования.")
-
-    def _encrypt_ecb(self, data: bytes) -> bytes:
-        encrypted_data = b''
-        for i in range(0, len(data), 8):
-            block = data[i:i+8]
-            if len(block) < 8:
-                block += b'\0' * (8 - len(block))
-            encrypted_block = self._process(block, self.round_keys)
-            encrypted_data += encrypted_block
-        return encrypted_data
-
-    def _decrypt_ecb(self, data: bytes) -> bytes:
-        decrypted_data = b''
-        for i in range(0, len(data), 8):
-            block = data[i:i+8]
-            decrypted_block = self._process(block, self.round_keys[::-1])
-            decrypted_data += decrypted_block
-        return decrypted_data
-
-    def _encrypt_cbc(self, data: bytes, iv: bytes) -> bytes:
-        encrypted_data = b''
-        previous_block = iv
-        for i in range(0, len(data), 8):
-            block = data[i:i+8]
-            if len(block) < 8:
-                block += b'\0' * (8 - len(block))
-            block = self._xor_bytes(block, previous_block)
-            encrypted_block = self._process(block, self.round_keys)
-            encrypted_data += encrypted_block
-            previous_block = encrypted_block
-        return encrypted_data
-
-    def _decrypt_cbc(self, data: bytes, iv: bytes) -> bytes:
-        decrypted_data = b''
-        previous_block = iv
-        for i in range(0, len(data), 8):
-            block = data[i:i+8]
-            decrypted_block = self._process(block, self.round_keys[::-1])
-            decrypted_block = self._xor_bytes(decrypted_block, previous_block)
-            decrypted_data += decrypted_block
-            previous_block = block
-        return decrypted_data
-
-    def _encrypt_cfb(self, data: bytes, iv: bytes) -> bytes:
-        encrypted_data = b''
-        previous_block = iv
-        for i in range(0, len(data), 8):
-            block = data[i:i+8]
-            if len(block) < 8:
-                block += b'\0' * (8 - len(block))
-            encrypted_block = self._process(previous_block, self.round_keys)
-            encrypted_block = self._xor_bytes(block, encrypted_block)
-            encrypted_data += encrypted_block
-            previous_block = encrypted_block
-        return encrypted_data
-
-    def _decrypt_cfb(self, data: bytes, iv: bytes) -> bytes:
-        decrypted_data = b''
-        previous_block = iv
-        for i in range(0, len(data), 8):
-            block = data[i:i+8]
-            decrypted_block = self._process(previous_block, self.round_keys)
-            decrypted_block = self._xor_bytes(block, decrypted_block)
-            decrypted_data += decrypted_block
-            previous_block = block
-        return decrypted_data
-
-    def _encrypt_ofb(self, data: bytes, iv: bytes) -> bytes:
-        encrypted_data = b''
-        previous_block = iv
-        for i in range(0, len(data), 8):
-            block = data[i:i+8]
-            if len(block) < 8:
-                block += b'\0' * (8 - len(block))
-            encrypted_block = self._process(previous_block, self.round_keys)
-            encrypted_block = self._xor_bytes(block, encrypted_block)
-            encrypted_data += encrypted_block
-            previous_block = self._process(previous_block, self.round_keys)
-        return encrypted_data
-
-    def _decrypt_ofb(self, data: bytes, iv: bytes) -> bytes:
-        decrypted_data = b''
-        previous_block = iv
-        for i in range(0, len(data), 8):
-            block = data[i:i+8]
-            decrypted_block = self._process(previous_block, self.round_keys)
-            decrypted_block = self._xor_bytes(block, decrypted_block)
-            decrypted_data += decrypted_block
-            previous_block = self._process(previous_block, self.round_keys)
-        return decrypted_data
-
-    def _encrypt_ctr(self, data: bytes, iv: bytes) -> bytes:
-        encrypted_data = b''
-        counter = int.from_bytes(iv, 'big')
-        for i in range(0, len(data), 8):
-            block = data[i:i+8]
-            if len(block) < 8:
-                block += b'\0' * (8 - len(block))
-            counter_block = counter.to_bytes(8, 'big')
-            encrypted_block = self._process(counter_block, self.round_keys)
-            encrypted_block = self._xor_bytes(block, encrypted_block)
-            encrypted_data += encrypted_block
-            counter += 1
-        return encrypted_data
-
-    def _decrypt_ctr(self, data: bytes, iv: bytes) -> bytes:
-        decrypted_data = b''
-        counter = int.from_bytes(iv, 'big')
-        for i in range(0, len(data), 8):
-            block = data[i:i+8]
-            counter_block = counter.to_bytes(8, 'big')
-            decrypted_block = self._process(counter_block, self.round_keys)
-            decrypted_block = self._xor_bytes(block, decrypted_block)
-            decrypted_data += decrypted_block
-            counter += 1
-        return decrypted_data
-
-    def _xor_bytes(self, a: bytes, b: bytes) -> bytes:
-        return bytes(x ^ y for x, y in zip(a, b))
-
 # Таблицы перестановок и расширений для DES
 IP = [
     58, 50, 42, 34, 26, 18, 10, 2,
@@ -342,53 +234,141 @@ P = [
 
 SHIFT_TABLE = [1, 1, 2, 2, 2, 2, 2, 2, 1, 2, 2, 2, 2, 2, 2, 1]
 
-# Адаптер для использования DES в качестве раундовой функции F
-class DESAdapter:
-    def __init__(self, des: DES):
-        self.des = des
+# Быстрое ядро DES: блок хранится как 64-битное целое, перестановки выполняются
+# по таблицам, проиндексированным байтами входа, таблицы строятся один раз при импорте
+def _permute_int(value: int, table: list[int], width: int) -> int:
+    result = 0
+    for position in table:
+        result = (result << 1) | ((value >> (width - position)) & 1)
+    return result
+
+def _build_byte_tables(table: list[int], width: int) -> tuple:
+    tables = []
+    for byte_index in range(width // 8):
+        shift = width - 8 * (byte_index + 1)
+        tables.append(tuple(_permute_int(byte << shift, table, width) for byte in range(256)))
+    return tuple(tables)
+
+def _build_sp_tables() -> tuple:
+    # Объединённые таблицы S-блок + перестановка P: 6 бит входа -> 32 бита выхода
+    tables = []
+    for i, s_box in enumerate(S_BOXES):
+        shift = 28 - 4 * i
+        table = []
+        for six_bits in range(64):
+            row = ((six_bits >> 4) & 0b10) | (six_bits & 1)
+            col = (six_bits >> 1) & 0xF
+            table.append(_permute_int(s_box[row][col] << shift, P, 32))
+        tables.append(tuple(table))
+    return tuple(tables)
+
+IP_TABLES = _build_byte_tables(IP, 64)
+IP_INV_TABLES = _build_byte_tables(IP_INV, 64)
+E_TABLES = _build_byte_tables(E, 32)
+SP_TABLES = _build_sp_tables()
+
+def des_process_block(block: int, round_keys: list[int]) -> int:
+    """Обработка одного 64-битного блока (как целого) по 48-битным раундовым ключам."""
+    ip0, ip1, ip2, ip3, ip4, ip5, ip6, ip7 = IP_TABLES
+    e0, e1, e2, e3 = E_TABLES
+    sp0, sp1, sp2, sp3, sp4, sp5, sp6, sp7 = SP_TABLES
+
+    block = (ip0[block >> 56] | ip1[(block >> 48) & 0xFF] | ip2[(block >> 40) & 0xFF]
+             | ip3[(block >> 32) & 0xFF] | ip4[(block >> 24) & 0xFF] | ip5[(block >> 16) & 0xFF]
+             | ip6[(block >> 8) & 0xFF] | ip7[block & 0xFF])
+    left, right = block >> 32, block & 0xFFFFFFFF
+
+    for round_key in round_keys:
+        x = (e0[right >> 24] | e1[(right >> 16) & 0xFF] | e2[(right >> 8) & 0xFF]
+             | e3[right & 0xFF]) ^ round_key
+        left, right = right, left ^ (sp0[x >> 42] | sp1[(x >> 36) & 0x3F] | sp2[(x >> 30) & 0x3F]
+                                     | sp3[(x >> 24) & 0x3F] | sp4[(x >> 18) & 0x3F]
+                                     | sp5[(x >> 12) & 0x3F] | sp6[(x >> 6) & 0x3F] | sp7[x & 0x3F])
+
+    block = (right << 32) | left
+    inv0, inv1, inv2, inv3, inv4, inv5, inv6, inv7 = IP_INV_TABLES
+    return (inv0[block >> 56] | inv1[(block >> 48) & 0xFF] | inv2[(block >> 40) & 0xFF]
+            | inv3[(block >> 32) & 0xFF] | inv4[(block >> 24) & 0xFF] | inv5[(block >> 16) & 0xFF]
+            | inv6[(block >> 8) & 0xFF] | inv7[block & 0xFF])
+
+# Реализация алгоритма DEAL: сеть Фейстеля над 128-битным блоком, раундовая функция -
+# шифрование DES 64-битной половины на раундовом ключе, выработанном из ключа DEAL
+DEAL_KEY_SCHEDULE_KEY = bytes.fromhex('0123456789abcdef')
+# Число раундов по длине ключа: 6 для 128 и 192 бит, 8 для 256 бит
+DEAL_ROUNDS = {16: 6, 24: 6, 32: 8}
+
+
+class DEALKeySchedule:
+    """Неизменяемое расписание DEAL: 64-битные раундовые ключи и развёрнутые по ним ключи DES."""
+    __slots__ = ('key', 'rounds', 'round_keys', 'des_keys')
 
-    def encrypt_block(self, block: bytes) -> bytes:
-        return self.des._process(block, self.des.round_keys)
-
-    def decrypt_block(self, block: bytes) -> bytes:
-        return self.des._process(block, self.des.round_keys[::-1])
-
-# Реализация алгоритма DEAL
-class DEAL:
     def __init__(self, key: bytes, rounds: int):
+        key = bytes(key)
+        if len(key) not in DEAL_ROUNDS:
+            raise ValueError("Длина ключа DEAL должна быть 128, 192 или 256 бит.")
+        if rounds not in (6, 8):
+            raise ValueError("Число раундов DEAL должно быть 6 или 8.")
+        round_keys = tuple(_generate_deal_round_keys(key, rounds))
+        object.__setattr__(self, 'key', key)
+        object.__setattr__(self, 'rounds', rounds)
+        object.__setattr__(self, 'round_keys', round_keys)
+        object.__setattr__(self, 'des_keys', tuple(
+            KEY_SCHEDULE_CACHE.get(round_key.to_bytes(8, 'big')).encrypt_keys for round_key in round_keys))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Расписание ключей неизменяемо.")
+
+
+DEAL_KEY_SCHEDULE_CACHE = KeyScheduleCache(lambda key_and_rounds: DEALKeySchedule(*key_and_rounds))
+
+
+def _generate_deal_round_keys(key: bytes, rounds: int) -> list[int]:
+    """RK_i = DES_B(K_(i mod s) XOR <2^(i-s)> XOR RK_(i-1)), где B = 0123456789abcdef,
+    а <j> - 64-битный блок с установленным j-м битом (нумерация битов как в DES, с 1)."""
+    key_blocks = [int.from_bytes(key[i:i+8], 'big') for i in range(0, len(key), 8)]
+    fixed_keys = KEY_SCHEDULE_CACHE.get(DEAL_KEY_SCHEDULE_KEY).encrypt_keys
+    round_keys = []
+    previous = 0
+    for i in range(rounds):
+        value = key_blocks[i % len(key_blocks)] ^ previous
+        if i >= len(key_blocks):
+            value ^= 1 << (64 - (1 << (i - len(key_blocks))))
+        previous = des_process_block(value, fixed_keys)
+        round_keys.append(previous)
+    return round_keys
+
+
+class DEAL(BlockCipher):
+    block_size = 16
+
+    def __init__(self, key: bytes, rounds: int = None, workers: int = 1,
+                 parallel_threshold: int = PARALLEL_THRESHOLD):
+        if len(key) not in DEAL_ROUNDS:
+            raise ValueError("Длина ключа DEAL должна быть 128, 192 или 256 бит.")
+        if rounds is None:
+            rounds = DEAL_ROUNDS[len(key)]
         self.key = key
         self.rounds = rounds
-        self.des = DES(key)
-        self.adapter = DESAdapter(self.des)
-
-    def encrypt(self, data: bytes) -> bytes:
-        encrypted_data = b''
-        for i in range(0, len(data), 8):
-            block = data[i:i+8]
-            if len(block) < 8:
-                block += b'\0' * (8 - len(block))
-            encrypted_block = self._process(block, self.adapter.encrypt_block)
-            encrypted_data += encrypted_block
-        return encrypted_data
-
-    def decrypt(self, data: bytes) -> bytes:
-        decrypted_data = b''
-        for i in range(0, len(data), 8):
-            block = data[i:i+8]
-            decrypted_block = self._process(block, self.adapter.decrypt_block)
-            decrypted_data += decrypted_block
-        return decrypted_data
-
-    def _process(self, block: bytes, round_function) -> bytes:
-        left, right = block[:4], block[4:]
-        for _ in range(self.rounds):
-            new_left = right
-            right = self._xor_bytes(left, round_function(right))
-            left = new_left
-        return left + right
-
-    def _xor_bytes(self, a: bytes, b: bytes) -> bytes:
-        return bytes(x ^ y for x, y in zip(a, b))
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self.schedule = DEAL_KEY_SCHEDULE_CACHE.get((bytes(key), rounds))
+        self.round_keys = self.schedule.des_keys
+        self.decrypt_round_keys = self.round_keys[::-1]
+
+    def _encrypt_block_int(self, block: int) -> int:
+        left, right = block >> 64, block & 0xFFFFFFFFFFFFFFFF
+        for keys in self.round_keys:
+            left, right = right, left ^ des_process_block(right, keys)
+        return (left << 64) | right
+
+    def _decrypt_block_int(self, block: int) -> int:
+        left, right = block >> 64, block & 0xFFFFFFFFFFFFFFFF
+        for keys in self.decrypt_round_keys:
+            left, right = right ^ des_process_block(left, keys), left
+        return (left << 64) | right
+
+    def _factory(self) -> tuple:
+        return DEAL, (bytes(self.key), self.rounds)
 
 # Пример использования
 if __name__ == "__main__":
@@ -396,7 +376,7 @@ if __name__ == "__main__":
     iv = os.urandom(8)
 
     des = DES(key)
-    deal = DEAL(key, rounds=16)
+    deal = DEAL(b"1234567890abcdef", rounds=6)
 
     # Псевдослучайная последовательность байтов
     data = os.urandom(16)
@@ -442,29 +422,26 @@ if __name__ == "__main__":
     print("Original data:", data)
     print("Encrypted data:", encrypted_data_ctr)
     print("Decrypted data:", decrypted_data_ctr)
+
+    # DEAL: 128-битный блок, режим CBC
+    deal_iv = os.urandom(16)
+    encrypted_data_deal = deal.encrypt(data, EncryptionMode.CBC, deal_iv)
+    decrypted_data_deal = deal.decrypt(encrypted_data_deal, EncryptionMode.CBC, deal_iv)
+    print("DEAL CBC:")
+    print("Original data:", data)
+    print("Encrypted data:", encrypted_data_deal)
+    print("Decrypted data:", decrypted_data_deal)
     
     #Это работа с файликом
 
     # Шифрование и дешифрование файлов
     def encrypt_file(input_file, output_file, mode: EncryptionMode, iv: bytes):
         with open(input_file, 'rb') as fin, open(output_file, 'wb') as fout:
-            while True:
-                chunk = fin.read(8)
-                if not chunk:
-                    break
-                if len(chunk) < 8:
-                    chunk += b'\0' * (8 - len(chunk))
-                encrypted_chunk = des.encrypt(chunk, mode, iv)
-                fout.write(encrypted_chunk)
+            encrypt_stream(des, fin, fout, mode, iv)
 
     def decrypt_file(input_file, output_file, mode: EncryptionMode, iv: bytes):
         with open(input_file, 'rb') as fin, open(output_file, 'wb') as fout:
-            while True:
-                chunk = fin.read(8)
-                if not chunk:
-                    break
-                decrypted_chunk = des.decrypt(chunk, mode, iv)
-                fout.write(decrypted_chunk.rstrip(b'\0'))
+            decrypt_stream(des, fin, fout, mode, iv, strip_padding=True)
 
     # Пример шифрования и дешифрования файла
     script_dir = os.path.dirname(os.path.abspath(__file__))
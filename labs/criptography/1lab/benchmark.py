@@ -0,0 +1,136 @@
+import argparse
+import os
+import resource
+import time
+
+from DEAL import DES, DESKeySchedule, EncryptionMode, KEY_SCHEDULE_CACHE
+
+
+def measure(function, blocks: list[bytes], round_keys) -> float:
+    """Количество обработанных блоков в секунду."""
+    start = time.perf_counter()
+    for block in blocks:
+        function(block, round_keys)
+    return len(blocks) / (time.perf_counter() - start)
+
+
+def bench_process(count: int = 2000):
+    """Сравнение строкового (эталонного) и целочисленного ядра DES."""
+    des = DES(os.urandom(8))
+    blocks = [os.urandom(8) for _ in range(count)]
+
+    for block in blocks[:100]:
+        assert des._process(block, des.round_keys) == des._process_bits(block, des.round_keys)
+
+    before = measure(des._process_bits, blocks, des.round_keys)
+    after = measure(des._process, blocks, des.round_keys)
+    print(f"DES._process: {before:,.0f} блоков/с (строки) -> {after:,.0f} блоков/с (целые), x{after / before:.1f}")
+
+
+def bench_key_schedule(count: int = 2000):
+    """Построение DES(key) без кэша и с повторяющимся (горячим) ключом."""
+    key = os.urandom(8)
+
+    start = time.perf_counter()
+    for _ in range(count):
+        DESKeySchedule(key)
+    cold = count / (time.perf_counter() - start)
+
+    KEY_SCHEDULE_CACHE.clear()
+    start = time.perf_counter()
+    for _ in range(count):
+        DES(key)
+    hot = count / (time.perf_counter() - start)
+    print(f"DES(key): {cold:,.0f} ключей/с (без кэша) -> {hot:,.0f} ключей/с (кэш), {KEY_SCHEDULE_CACHE.info()}")
+
+
+def parse_size(text: str) -> int:
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    text = text.strip().upper()
+    if text[-1] in units:
+        return int(text[:-1]) * units[text[-1]]
+    return int(text)
+
+
+def encrypt_concat(des: DES, data: bytes, iv: bytes) -> bytes:
+    """DES-CBC тем же целочисленным ядром, но с выводом через += (каждое сложение копирует весь шифртекст)."""
+    process = des._encrypt_block_int
+    previous_block = int.from_bytes(iv, 'big')
+    result = b''
+    for i in range(0, len(data), 8):
+        previous_block = process(int.from_bytes(data[i:i+8], 'big') ^ previous_block)
+        result += previous_block.to_bytes(8, 'big')
+    return result
+
+
+def encrypt_prealloc(des: DES, data: bytes, iv: bytes) -> bytearray:
+    """DES-CBC с записью в заранее выделенный bytearray (DES.encrypt_into)."""
+    out = bytearray(len(data))
+    des.encrypt_into(data, out, EncryptionMode.CBC, iv)
+    return out
+
+
+def timed(function, *args) -> tuple[float, int]:
+    """Время работы и прирост пикового RSS процесса (байт) за вызов функции."""
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    function(*args)
+    elapsed = time.perf_counter() - start
+    return elapsed, (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) * 1024
+
+
+def bench_buffers(sizes: list[int], concat_limit: int):
+    """DES-CBC: сборка шифртекста через += против записи в заранее выделенный буфер (encrypt_into)."""
+    des = DES(os.urandom(8))
+    iv = os.urandom(8)
+    for size in sizes:
+        mb = size / (1 << 20)
+        data = os.urandom(size)
+        elapsed, peak = timed(encrypt_prealloc, des, data, iv)
+        print(f"{mb:g} MB, DES-CBC в буфер: {mb / elapsed:,.3f} MB/s, прирост пикового RSS {peak / (1 << 20):,.1f} MB")
+        if size <= concat_limit:
+            assert encrypt_concat(des, data[:4096], iv) == encrypt_prealloc(des, data[:4096], iv)
+            elapsed, peak = timed(encrypt_concat, des, data, iv)
+            print(f"{mb:g} MB, DES-CBC через +=: {mb / elapsed:,.3f} MB/s, прирост пикового RSS {peak / (1 << 20):,.1f} MB")
+        else:
+            print(f"{mb:g} MB, DES-CBC через +=: пропущено (квадратичное копирование)")
+        del data
+
+
+def bench_numpy(counts: list[int]):
+    """Пакетное векторизованное ядро (NumPy) против поблочного DES._process."""
+    import numpy as np
+    from des_numpy import des_encrypt_blocks
+
+    des = DES(os.urandom(8))
+    sample = [os.urandom(8) for _ in range(10000)]
+    serial = measure(des._process, sample, des.round_keys)
+    print(f"DES._process: {serial:,.0f} блоков/с")
+    for count in counts:
+        blocks = np.frombuffer(os.urandom(8 * count), dtype=np.uint64)
+        start = time.perf_counter()
+        des_encrypt_blocks(des, blocks)
+        rate = count / (time.perf_counter() - start)
+        print(f"des_encrypt_blocks, {count:,} блоков: {rate:,.0f} блоков/с, x{rate / serial:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарки DES")
+    parser.add_argument('benchmarks', nargs='*', help="process, keys, buffers, numpy (по умолчанию process, keys, buffers)")
+    parser.add_argument('--sizes', default='1M,16M', help="размеры входа для buffers")
+    parser.add_argument('--blocks', default='10000,100000,1000000,10000000', help="число блоков для numpy")
+    parser.add_argument('--concat-limit', default='1M', help="максимальный размер для сборки через +=")
+    args = parser.parse_args()
+    benchmarks = args.benchmarks or ['process', 'keys', 'buffers']
+    unknown = set(benchmarks) - {'process', 'keys', 'buffers', 'numpy'}
+    if unknown:
+        parser.error(f"неизвестные бенчмарки: {', '.join(sorted(unknown))}")
+
+    if 'process' in benchmarks:
+        bench_process()
+    if 'keys' in benchmarks:
+        bench_key_schedule()
+    if 'buffers' in benchmarks:
+        bench_buffers([parse_size(size) for size in args.sizes.split(',')], parse_size(args.concat_limit))
+    if 'numpy' in benchmarks:
+        bench_numpy([int(count) for count in args.blocks.split(',')])
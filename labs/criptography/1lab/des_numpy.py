@@ -0,0 +1,108 @@
+import numpy as np
+
+from DEAL import DES, E_TABLES, IP_INV_TABLES, IP_TABLES, SP_TABLES
+
+# Векторизованное ядро DES: все блоки пакета обрабатываются одновременно,
+# перестановки и S-блоки выполняются выборкой из тех же таблиц, что и в DEAL.py
+IP_ARRAY = np.array(IP_TABLES, dtype=np.uint64)
+IP_INV_ARRAY = np.array(IP_INV_TABLES, dtype=np.uint64)
+E_ARRAY = np.array(E_TABLES, dtype=np.uint64)
+SP_ARRAY = np.array(SP_TABLES, dtype=np.uint64)
+
+CHUNK_BLOCKS = 1 << 15
+
+
+def _permute_blocks(blocks: np.ndarray, tables: np.ndarray) -> np.ndarray:
+    result = tables[0][blocks >> 56]
+    for i in range(1, 8):
+        result |= tables[i][(blocks >> (56 - 8 * i)) & 0xFF]
+    return result
+
+
+def _process_chunk(blocks: np.ndarray, round_keys) -> np.ndarray:
+    e0, e1, e2, e3 = E_ARRAY
+    sp0, sp1, sp2, sp3, sp4, sp5, sp6, sp7 = SP_ARRAY
+
+    blocks = _permute_blocks(blocks, IP_ARRAY)
+    left, right = blocks >> 32, blocks & 0xFFFFFFFF
+
+    for round_key in round_keys:
+        x = e0[right >> 24] | e1[(right >> 16) & 0xFF] | e2[(right >> 8) & 0xFF] | e3[right & 0xFF]
+        x ^= np.uint64(round_key)
+        f = sp0[x >> 42]
+        f |= sp1[(x >> 36) & 0x3F]
+        f |= sp2[(x >> 30) & 0x3F]
+        f |= sp3[(x >> 24) & 0x3F]
+        f |= sp4[(x >> 18) & 0x3F]
+        f |= sp5[(x >> 12) & 0x3F]
+        f |= sp6[(x >> 6) & 0x3F]
+        f |= sp7[x & 0x3F]
+        left, right = right, left ^ f
+
+    return _permute_blocks((right << 32) | left, IP_INV_ARRAY)
+
+
+def des_process_blocks(blocks: np.ndarray, round_keys, chunk_blocks: int = CHUNK_BLOCKS) -> np.ndarray:
+    """Обработка массива 64-битных блоков uint64 (N,), результат совпадает с des_process_block для каждого."""
+    blocks = np.ascontiguousarray(blocks, dtype=np.uint64)
+    result = np.empty_like(blocks)
+    for start in range(0, len(blocks), chunk_blocks):
+        result[start:start+chunk_blocks] = _process_chunk(blocks[start:start+chunk_blocks], round_keys)
+    return result
+
+
+def to_blocks(data) -> np.ndarray:
+    """Байты или массив uint8 (N, 8) -> массив блоков uint64 (big-endian, как в DES._process)."""
+    if not isinstance(data, np.ndarray):
+        data = np.frombuffer(data, dtype=np.uint8)
+    array = np.ascontiguousarray(data, dtype=np.uint8).reshape(-1)
+    if array.size % 8:
+        raise ValueError("Длина данных должна быть кратна 8 байтам.")
+    return array.view('>u8').astype(np.uint64)
+
+
+def from_blocks(blocks: np.ndarray) -> np.ndarray:
+    """Массив блоков uint64 -> массив uint8 (N, 8)."""
+    return blocks.astype('>u8').view(np.uint8).reshape(-1, 8)
+
+
+def _crypt_blocks(blocks: np.ndarray, round_keys) -> np.ndarray:
+    if blocks.dtype == np.uint8:
+        return from_blocks(des_process_blocks(to_blocks(blocks), round_keys))
+    return des_process_blocks(blocks, round_keys)
+
+
+def des_encrypt_blocks(des: DES, blocks: np.ndarray) -> np.ndarray:
+    """Пакетное шифрование независимых блоков (ECB): uint64 (N,) или uint8 (N, 8)."""
+    return _crypt_blocks(blocks, des.round_keys)
+
+
+def des_decrypt_blocks(des: DES, blocks: np.ndarray) -> np.ndarray:
+    """Пакетное дешифрование независимых блоков (ECB): uint64 (N,) или uint8 (N, 8)."""
+    return _crypt_blocks(blocks, des.decrypt_round_keys)
+
+
+def des_ctr_many(des: DES, messages: list[bytes], ivs: list[bytes], decrypt: bool = False) -> list[bytes]:
+    """CTR для множества сообщений, у каждого свой начальный счётчик; гамма всех сообщений считается одним пакетом.
+
+    Результат совпадает с DES.encrypt/decrypt(message, EncryptionMode.CTR, iv) для каждой пары.
+    """
+    if len(messages) != len(ivs):
+        raise ValueError("Количество сообщений и векторов инициализации должно совпадать.")
+    counts = np.array([(len(message) + 7) // 8 for message in messages], dtype=np.int64)
+    starts = np.array([int.from_bytes(iv, 'big') for iv in ivs], dtype=np.uint64)
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1])) if len(messages) else np.zeros(0, dtype=np.int64)
+    index_in_message = np.arange(counts.sum(), dtype=np.uint64) - np.repeat(offsets, counts).astype(np.uint64)
+    counters = np.repeat(starts, counts) + index_in_message
+    keystream = from_blocks(des_process_blocks(counters, des.round_keys)).reshape(-1)
+
+    padded = np.zeros(int(counts.sum()) * 8, dtype=np.uint8)
+    for message, offset in zip(messages, offsets):
+        padded[offset * 8:offset * 8 + len(message)] = np.frombuffer(message, dtype=np.uint8)
+    padded ^= keystream
+
+    results = []
+    for message, offset, count in zip(messages, offsets, counts):
+        length = len(message) if decrypt else int(count) * 8
+        results.append(padded[offset * 8:offset * 8 + length].tobytes())
+    return results
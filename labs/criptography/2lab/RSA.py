@@ -1,3 +1,4 @@
+import math
 import random
 from abc import ABC, abstractmethod
 
@@ -11,12 +12,15 @@ class MathService:
 
     @staticmethod
     def extended_gcd(a, b):
-        """Расширенный алгоритм Евклида (НОД и коэффициенты Безу)."""
-        if a == 0:
-            return (b, 0, 1)
-        else:
-            g, x, y = MathService.extended_gcd(b % a, a)
-            return (g, y - (b // a) * x, x)
+        """Расширенный алгоритм Евклида (НОД и коэффициенты Безу: g = a * x + b * y)."""
+        # Итеративно: рекурсия упирается в лимит глубины на числах в тысячи бит
+        x0, x1, y0, y1 = 1, 0, 0, 1
+        while b != 0:
+            q = a // b
+            a, b = b, a - q * b
+            x0, x1 = x1, x0 - q * x1
+            y0, y1 = y1, y0 - q * y1
+        return (a, x0, y0)
 
     @staticmethod
     def legendre_symbol(a, p):
@@ -52,15 +56,213 @@ class MathService:
 
     @staticmethod
     def mod_pow(a, b, mod):
-        """Возведение в степень по модулю."""
+        """Возведение в степень по модулю (встроенный pow: по замерам modexp не медленнее MOD_POW_BACKENDS)."""
+        return pow(a, b, mod)
+
+    @staticmethod
+    def fixed_base(base, mod, max_bits=None):
+        """Предвычисление для многократного возведения одного основания по одному модулю."""
+        return FixedBaseModPow(base, mod, max_bits)
+
+# Реализации возведения в степень по модулю (показатель b >= 0)
+class ModPowBackend(ABC):
+    name = None
+
+    @abstractmethod
+    def pow(self, a, b, mod):
+        """a^b mod mod."""
+        pass
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+class BuiltinModPow(ModPowBackend):
+    """Встроенный pow(a, b, mod) (оконный метод на C)."""
+    name = 'builtin'
+
+    def pow(self, a, b, mod):
+        return pow(a, b, mod)
+
+class SquareAndMultiplyModPow(ModPowBackend):
+    """Бинарный метод справа налево: бит за битом, квадрат и умножение."""
+    name = 'square-and-multiply'
+
+    def pow(self, a, b, mod):
         result = 1
         a = a % mod
         while b > 0:
-            if b % 2 == 1:
-                result = (result * a) % mod
-            a = (a * a) % mod
-            b //= 2
-        return result
+            if b & 1:
+                result = result * a % mod
+            a = a * a % mod
+            b >>= 1
+        return result % mod
+
+class SlidingWindowModPow(ModPowBackend):
+    """
+    Скользящее окно слева направо: таблица нечётных степеней a, a^3, ..., a^(2^k - 1),
+    на окно - k возведений в квадрат и одно умножение, нулевые биты - только квадрат.
+    """
+    name = 'sliding-window'
+    # (длина показателя в битах, ширина окна) - окно, минимизирующее число умножений
+    WINDOWS = ((24, 2), (80, 3), (240, 4), (672, 5), (1792, 6))
+
+    def __init__(self, window=None):
+        self.window = window
+
+    def window_size(self, bits):
+        if self.window:
+            return self.window
+        for limit, window in self.WINDOWS:
+            if bits <= limit:
+                return window
+        return 7
+
+    def pow(self, a, b, mod):
+        a = a % mod
+        k = self.window_size(b.bit_length())
+        square = a * a % mod
+        odd_powers = [a]
+        for _ in range((1 << (k - 1)) - 1):
+            odd_powers.append(odd_powers[-1] * square % mod)
+
+        result = 1
+        i = b.bit_length() - 1
+        while i >= 0:
+            if not (b >> i) & 1:
+                result = result * result % mod
+                i -= 1
+                continue
+            # Самое длинное окно b[i..j] (не длиннее k) с единицей в младшем бите
+            j = max(i - k + 1, 0)
+            while not (b >> j) & 1:
+                j += 1
+            for _ in range(i - j + 1):
+                result = result * result % mod
+            result = result * odd_powers[((b >> j) & ((1 << (i - j + 1)) - 1)) >> 1] % mod
+            i = j - 1
+        return result % mod
+
+class FixedBaseModPow:
+    """
+    Неизменяемое предвычисление для фиксированных основания и модуля: в строке i таблицы -
+    base^(d * 2^(w * i)) для всех цифр d, так что возведение стоит одно умножение на w бит показателя
+    и ни одного возведения в квадрат. Окупается с десятка возведений (одно основание, разные показатели).
+    """
+    __slots__ = ('base', 'mod', 'max_bits', 'window', 'rows')
+
+    def __init__(self, base, mod, max_bits=None, window=5):
+        max_bits = max_bits or mod.bit_length()
+        rows = []
+        g = base % mod
+        for _ in range((max_bits + window - 1) // window):
+            row = [1, g]
+            for _ in range((1 << window) - 2):
+                row.append(row[-1] * g % mod)
+            rows.append(tuple(row))
+            g = row[-1] * g % mod
+        object.__setattr__(self, 'base', base % mod)
+        object.__setattr__(self, 'mod', mod)
+        object.__setattr__(self, 'max_bits', max_bits)
+        object.__setattr__(self, 'window', window)
+        object.__setattr__(self, 'rows', tuple(rows))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Предвычисление неизменяемо.")
+
+    def __repr__(self):
+        return f"FixedBaseModPow(bits={self.mod.bit_length()}, max_bits={self.max_bits}, window={self.window})"
+
+    def pow(self, exponent):
+        """base^exponent mod mod; показатели длиннее max_bits досчитываются обычным pow."""
+        if exponent.bit_length() > self.max_bits:
+            return pow(self.base, exponent, self.mod)
+        mod, window, mask = self.mod, self.window, (1 << self.window) - 1
+        result = 1
+        for row in self.rows:
+            if not exponent:
+                break
+            digit = exponent & mask
+            if digit:
+                result = result * row[digit] % mod
+            exponent >>= window
+        return result % mod
+
+# Реализации для сравнения в benchmark.py modexp (MathService.mod_pow - встроенный pow)
+MOD_POW_BACKENDS = (BuiltinModPow(), SlidingWindowModPow(), SquareAndMultiplyModPow())
+
+def _small_primes(limit):
+    """Нечётные простые меньше limit (решето Эратосфена)."""
+    sieve = bytearray([1]) * limit
+    sieve[:2] = b'\x00\x00'
+    for p in range(2, int(limit ** 0.5) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, limit, p)))
+    return tuple(p for p in range(3, limit, 2) if sieve[p])
+
+# Решето малых простых, общее для тестов простоты и PrimeGenerator: нечётные простые до 2^15 (3511 штук),
+# их множество и произведение (пробное деление всеми сразу - одним НОД)
+SIEVE_LIMIT = 1 << 15
+SMALL_PRIMES = _small_primes(SIEVE_LIMIT)
+SMALL_PRIME_SET = frozenset(SMALL_PRIMES)
+SMALL_PRIMES_PRODUCT = math.prod(SMALL_PRIMES)
+
+# Пакетный отсев: кандидаты группируются так, чтобы произведение группы было около 2^14 бит
+SCREEN_BATCH_BITS = 1 << 14
+
+def _screen_small(n):
+    """Решение без деления: True/False, или None для нечётного n не меньше 2^15."""
+    if n < 2:
+        return False
+    if n % 2 == 0:
+        return n == 2
+    if n < SIEVE_LIMIT:
+        return n in SMALL_PRIME_SET
+    return None
+
+def _screen_residue(n, residue):
+    """Решение по остатку произведения малых простых по модулю n."""
+    if math.gcd(n, residue) != 1:
+        return False
+    # Без делителей меньше 2^15 число меньше 2^30 простое
+    return True if n < SIEVE_LIMIT * SIEVE_LIMIT else None
+
+def screen(n):
+    """Проверка малыми простыми: True/False, если её достаточно, иначе None (нужен тест простоты)."""
+    decided = _screen_small(n)
+    if decided is not None:
+        return decided
+    return _screen_residue(n, SMALL_PRIMES_PRODUCT % n)
+
+def _tree_remainders(value, moduli):
+    """value mod m для всех m из moduli: дерево произведений, затем спуск остатков от корня к листьям."""
+    tree = [list(moduli)]
+    while len(tree[-1]) > 1:
+        level = tree[-1]
+        tree.append([math.prod(level[i:i + 2]) for i in range(0, len(level), 2)])
+    remainders = [value % tree[-1][0]]
+    for level in reversed(tree[:-1]):
+        remainders = [remainders[i // 2] % m for i, m in enumerate(level)]
+    return remainders
+
+def screen_many(ns):
+    """
+    screen для набора чисел. Произведение малых простых (~47 тыс. бит) делится не на каждое n, а один раз
+    на произведение группы кандидатов, остаток спускается по дереву произведений группы - для 64-битных
+    чисел отсев в 4 раза быстрее поштучного, для 1024-битных не медленнее.
+    """
+    results = [_screen_small(n) for n in ns]
+    pending = [i for i, decided in enumerate(results) if decided is None]
+    start = size = 0
+    for end, i in enumerate(pending, 1):
+        size += ns[i].bit_length()
+        if size < SCREEN_BATCH_BITS and end < len(pending):
+            continue
+        group = pending[start:end]
+        residues = _tree_remainders(SMALL_PRIMES_PRODUCT, [ns[j] for j in group])
+        for j, residue in zip(group, residues):
+            results[j] = _screen_residue(ns[j], residue)
+        start, size = end, 0
+    return results
 
 # Вероятностный тест простоты
 class PrimalityTest(ABC):
@@ -68,23 +270,32 @@ class PrimalityTest(ABC):
         self.min_probability = min_probability
 
     def is_prime(self, n):
-        if n < 2:
-            return False
-        if n == 2:
-            return True
-        if n % 2 == 0:
-            return False
+        decided = screen(n)
+        if decided is not None:
+            return decided
+        return self.test_iterations(n, self.get_iterations(n))
+
+    def is_prime_many(self, ns):
+        """Пакетная проверка: отсев малыми простыми сразу для всех чисел (screen_many), тест - только
+        для уцелевших; повторы проверяются один раз."""
+        unique = list(dict.fromkeys(ns))
+        results = dict(zip(unique, screen_many(unique)))
+        for n, decided in results.items():
+            if decided is None:
+                results[n] = self.test_iterations(n, self.get_iterations(n))
+        return [results[n] for n in ns]
+
+    def get_iterations(self, n):
+        """Вычисление количества итераций для достижения заданной вероятности."""
+        return int(1 / (1 - self.min_probability))
 
-        k = self.get_iterations(n)
+    def test_iterations(self, n, k):
+        """k итераций теста (n нечётно, больше 3); False - при первой неудачной."""
         for _ in range(k):
             if not self.test_iteration(n):
                 return False
         return True
 
-    def get_iterations(self, n):
-        """Вычисление количества итераций для достижения заданной вероятности."""
-        return int(1 / (1 - self.min_probability))
-
     @abstractmethod
     def test_iteration(self, n):
         """Одна итерация теста простоты."""
@@ -104,38 +315,264 @@ class SolovayStrassenTest(PrimalityTest):
         return MathService.mod_pow(a, (n - 1) // 2, n) == x % n
 
 class MillerRabinTest(PrimalityTest):
-    def test_iteration(self, n):
-        d = n - 1
-        s = 0
-        while d % 2 == 0:
-            d //= 2
-            s += 1
-        a = random.randint(2, n - 2)
+    # (граница, основания): для n меньше границы проверка по всем основаниям точна
+    # (Jaeschke; Zhang; Sorenson и Webster) - случайные основания не нужны
+    DETERMINISTIC_WITNESSES = (
+        (2047, (2,)),
+        (1373653, (2, 3)),
+        (25326001, (2, 3, 5)),
+        (3215031751, (2, 3, 5, 7)),
+        (2152302898747, (2, 3, 5, 7, 11)),
+        (3474749660383, (2, 3, 5, 7, 11, 13)),
+        (341550071728321, (2, 3, 5, 7, 11, 13, 17)),
+        (3825123056546413051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+        (318665857834031151167461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+        (3317044064679887385961981, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)),
+    )
+
+    @staticmethod
+    def decompose(n):
+        """Разложение n - 1 = d * 2^s с нечётным d."""
+        s = ((n - 1) & (1 - n)).bit_length() - 1
+        return (n - 1) >> s, s
+
+    @staticmethod
+    def strong_probable_prime(n, a, d, s):
+        """Сильная проверка по основанию a при известном разложении n - 1 = d * 2^s."""
+        a %= n
+        if a == 0:
+            return True
         x = MathService.mod_pow(a, d, n)
         if x == 1 or x == n - 1:
             return True
         for _ in range(s - 1):
-            x = MathService.mod_pow(x, 2, n)
+            x = x * x % n
             if x == n - 1:
                 return True
         return False
 
+    @classmethod
+    def deterministic_witnesses(cls, n):
+        """Набор оснований, точный для n, или None, если n слишком велико."""
+        return next((witnesses for bound, witnesses in cls.DETERMINISTIC_WITNESSES if n < bound), None)
+
+    def test_iteration(self, n):
+        d, s = self.decompose(n)
+        return self.strong_probable_prime(n, random.randint(2, n - 2), d, s)
+
+    def test_iterations(self, n, k):
+        # Разложение n - 1 - один раз на все основания
+        d, s = self.decompose(n)
+        witnesses = self.deterministic_witnesses(n)
+        if witnesses is None:
+            witnesses = (random.randint(2, n - 2) for _ in range(k))
+        return all(self.strong_probable_prime(n, a, d, s) for a in witnesses)
+
+class BailliePSWTest(PrimalityTest):
+    """
+    Тест Бейли-Померанса-Селфриджа-Вагстаффа: сильный тест по основанию 2 и сильный тест Люка
+    с параметрами Селфриджа. Детерминирован (составных, проходящих его, не известно), поэтому
+    итерация одна, а min_probability не используется.
+    """
+
+    def __init__(self, min_probability=1.0):
+        super().__init__(min_probability)
+
+    def get_iterations(self, n):
+        return 1
+
+    def test_iterations(self, n, k):
+        return self.test_iteration(n)
+
+    def test_iteration(self, n):
+        d, s = MillerRabinTest.decompose(n)
+        return MillerRabinTest.strong_probable_prime(n, 2, d, s) and self.strong_lucas(n)
+
+    @staticmethod
+    def strong_lucas(n):
+        """Сильный тест Люка: D - первое из 5, -7, 9, -11, ... с символом Якоби (D/n) = -1, P = 1, Q = (1 - D) / 4."""
+        if math.isqrt(n) ** 2 == n:
+            return False
+        D = 5
+        while True:
+            jacobi = MathService.jacobi_symbol(D, n)
+            if jacobi == -1:
+                break
+            if jacobi == 0:
+                return n == abs(D)
+            D = -D - 2 if D > 0 else -D + 2
+        Q = (1 - D) // 4
+
+        # n + 1 = d * 2^s; U_d, V_d, Q^d удвоением и шагом +1 по битам d (деление на 2 - по модулю нечётного n)
+        s = ((n + 1) & -(n + 1)).bit_length() - 1
+        d = (n + 1) >> s
+        U, V, Qk = 1, 1, Q % n
+        for bit in bin(d)[3:]:
+            U, V, Qk = U * V % n, (V * V - 2 * Qk) % n, Qk * Qk % n
+            if bit == '1':
+                U, V = (U + V) % n, (D * U + V) % n
+                U = (U + n if U & 1 else U) >> 1
+                V = (V + n if V & 1 else V) >> 1
+                Qk = Qk * Q % n
+        if U == 0 or V == 0:
+            return True
+        for _ in range(s - 1):
+            V, Qk = (V * V - 2 * Qk) % n, Qk * Qk % n
+            if V == 0:
+                return True
+        return False
+
+class RSAPrivateKey:
+    """
+    Неизменяемый закрытый ключ RSA с параметрами китайской теоремы об остатках:
+    dP = d mod (p - 1), dQ = d mod (q - 1), qInv = q^(-1) mod p.
+    """
+    __slots__ = ('n', 'e', 'd', 'p', 'q', 'dP', 'dQ', 'qInv')
+
+    def __init__(self, p, q, e, d):
+        if p == q:
+            raise ValueError("p и q должны быть различны")
+        if p < q:
+            p, q = q, p
+        _, q_inv, _ = MathService.extended_gcd(q, p)
+        object.__setattr__(self, 'n', p * q)
+        object.__setattr__(self, 'e', e)
+        object.__setattr__(self, 'd', d)
+        object.__setattr__(self, 'p', p)
+        object.__setattr__(self, 'q', q)
+        object.__setattr__(self, 'dP', d % (p - 1))
+        object.__setattr__(self, 'dQ', d % (q - 1))
+        object.__setattr__(self, 'qInv', q_inv % p)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Закрытый ключ неизменяем.")
+
+    def __iter__(self):
+        """Совместимость с прежним форматом закрытого ключа: d, n = private_key."""
+        return iter((self.d, self.n))
+
+    def __repr__(self):
+        return f"RSAPrivateKey(bits={self.n.bit_length()}, e={self.e})"
+
+    def decrypt(self, c):
+        """Закрытая операция через КТО: две экспоненты половинной длины и сборка по Гарнеру."""
+        m_p = MathService.mod_pow(c, self.dP, self.p)
+        m_q = MathService.mod_pow(c, self.dQ, self.q)
+        h = (self.qInv * (m_p - m_q)) % self.p
+        m = m_q + h * self.q
+        # Проверка открытой экспонентой: сбой в одной из половин иначе выдал бы множитель n
+        if MathService.mod_pow(m, self.e, self.n) != c % self.n:
+            raise ValueError("Ошибка вычисления КТО: результат не прошёл проверку открытой экспонентой")
+        return m
+
+    def sign(self, m):
+        """Подпись числа m (та же закрытая операция)."""
+        return self.decrypt(m)
+
+    def decrypt_without_crt(self, c):
+        """Закрытая операция без КТО (одна экспонента полной длины), для сравнения."""
+        return MathService.mod_pow(c, self.d, self.n)
+
+
+class PrimeGenerator:
+    """
+    Поиск случайного простого заданной длины. От случайного нечётного начала просеивается окно
+    из window нечётных кандидатов по SMALL_PRIMES: остатки начала окна по каждому малому простому
+    считаются один раз и при сдвиге окна обновляются прибавлением его длины. Уцелевшие кандидаты
+    проходят тест Ферма по основанию 2, затем test_iterations теста простоты с числом раундов
+    по длине кандидата (FIPS 186-4, приложение C.3).
+    """
+    # (длина простого в битах, требуемая вероятность ошибки 2^-k): n длиной 1024, 2048, 3072 и более бит
+    SECURITY_LEVELS = ((512, 100), (1024, 112))
+    MAX_SECURITY_LEVEL = 128
+    # FIPS 186-4, таблица C.3 (только Миллер-Рабин): простые p, q длиной 512, 1024 и 1536 бит.
+    # Одна замкнутая оценка из miller_rabin_rounds грубее расчёта стандарта и на этих длинах даёт
+    # на раунд больше (8/5/4), поэтому для них берутся табличные значения
+    FIPS_ROUNDS = ((512, 7), (1024, 4), (1536, 3))
+
+    def __init__(self, primality_test, window=4096):
+        self.primality_test = primality_test
+        self.window = window
+
+    @staticmethod
+    def miller_rabin_rounds(bits):
+        """
+        Число раундов Миллера-Рабина для случайного кандидата длины bits: для длин из таблицы C.3 -
+        её значение, иначе наименьшее t с оценкой Дамгарда-Ландрока-Померанса
+        k^(3/2) 2^t t^(-1/2) 4^(2 - sqrt(tk)) <= 2^-level (3 <= t <= k/9); вне области оценки - худший случай 4^-t.
+        """
+        rounds = dict(PrimeGenerator.FIPS_ROUNDS).get(bits)
+        if rounds:
+            return rounds
+        level = next((level for limit, level in PrimeGenerator.SECURITY_LEVELS if bits <= limit),
+                     PrimeGenerator.MAX_SECURITY_LEVEL)
+        for t in range(3, bits // 9 + 1):
+            if 1.5 * math.log2(bits) + t - 0.5 * math.log2(t) + 2 * (2 - math.sqrt(t * bits)) <= -level:
+                return t
+        return (level + 1) // 2
+
+    @staticmethod
+    def _sieve(start, window, primes, residues):
+        """Флаги окна start, start + 2, ..., start + 2 * (window - 1): 1 - кандидат не делится ни на одно из primes."""
+        flags = bytearray([1]) * window
+        for p, r in zip(primes, residues):
+            # start + 2j = 0 (mod p)  <=>  j = -r / 2 (mod p)
+            j = (p - r) * ((p + 1) // 2) % p
+            if j < window:
+                flags[j::p] = bytes(len(range(j, window, p)))
+        return flags
+
+    def generate(self, bits, rng=random, stop=None):
+        """
+        Случайное простое ровно из bits бит (два старших бита установлены: произведение двух таких - 2 * bits бит).
+        stop - событие (threading/multiprocessing.Event или объект с is_set()) для прерывания поиска:
+        проверяется перед проверкой простоты каждого кандидата, результат - None.
+        """
+        if bits < 3:
+            raise ValueError("Длина простого должна быть не менее 3 бит")
+        rounds = self.miller_rabin_rounds(bits)
+        while True:
+            start = rng.getrandbits(bits) | (3 << (bits - 2)) | 1
+            # Малые простые, не меньшие кандидата, сами могут оказаться кандидатом - ими не просеиваем
+            primes = SMALL_PRIMES if SMALL_PRIMES[-1] < start else tuple(p for p in SMALL_PRIMES if p < start)
+            residues = [start % p for p in primes]
+            # Окна не выходят за длину bits; кандидаты кончились - новое случайное начало
+            while start < 1 << bits:
+                window = min(self.window, ((1 << bits) - start + 1) // 2)
+                for j, flag in enumerate(self._sieve(start, window, primes, residues)):
+                    if not flag:
+                        continue
+                    # Окно - тысячи проверок простоты, поэтому прерывание проверяется на каждом кандидате
+                    if stop is not None and stop.is_set():
+                        return None
+                    if self._is_probable_prime(start + 2 * j, rounds):
+                        return start + 2 * j
+                start += 2 * window
+                residues = [(r + 2 * window) % p for p, r in zip(primes, residues)]
+
+    def _is_probable_prime(self, n, rounds):
+        if MathService.mod_pow(2, n - 1, n) != 1:
+            return False
+        return self.primality_test.test_iterations(n, rounds)
+
 class RSAKeyGenerator:
     def __init__(self, primality_test, min_probability, key_length):
         self.primality_test = primality_test
         self.min_probability = min_probability
         self.key_length = key_length
+        self.prime_generator = PrimeGenerator(primality_test)
 
     def generate_prime(self):
-        while True:
-            p = random.getrandbits(self.key_length // 2)
-            p |= (1 << self.key_length // 2 - 1) | 1
-            if self.primality_test.is_prime(p):
-                return p
+        return self.prime_generator.generate(self.key_length // 2)
 
     def generate_keys(self):
         p = self.generate_prime()
         q = self.generate_prime()
+        return self.keys_from_primes(p, q)
+
+    @staticmethod
+    def keys_from_primes(p, q):
+        """Открытый и закрытый ключи по простым p и q."""
         n = p * q
         phi = (p - 1) * (q - 1)
 
@@ -146,7 +583,7 @@ class RSAKeyGenerator:
         _, d, _ = MathService.extended_gcd(e, phi)
         d = d % phi
 
-        return (e, n), (d, n)
+        return (e, n), RSAPrivateKey(p, q, e, d)
 
 class RSA:
     def __init__(self, key_generator):
@@ -167,16 +604,24 @@ class RSA:
 
     def decrypt(self, input_file, output_file):
         """Дешифрование содержимого файла."""
-        d, n = self.private_key
         with open(input_file, 'rb') as f:
             data = f.read()
         # Преобразуем данные в число
         encrypted = int.from_bytes(data, 'big')
-        decrypted = MathService.mod_pow(encrypted, d, n)
+        decrypted = self.private_key.decrypt(encrypted)
         with open(output_file, 'wb') as f:
             f.write(decrypted.to_bytes((decrypted.bit_length() + 7) // 8, 'big'))
         print(f"Файл '{input_file}' расшифрован и сохранён как '{output_file}'")
 
+    def sign(self, message):
+        """Подпись числа message закрытым ключом."""
+        return self.private_key.sign(message)
+
+    def verify(self, message, signature):
+        """Проверка подписи открытым ключом."""
+        e, n = self.public_key
+        return MathService.mod_pow(signature, e, n) == message % n
+
 # Атака Ферма
 class FermatAttack:
     @staticmethod
@@ -246,6 +691,9 @@ if __name__ == "__main__":
     miller_rabin_test = MillerRabinTest(min_probability=0.99)
     print(f"Тест Миллера-Рабина {num}:", miller_rabin_test.is_prime(num))
 
+    baillie_psw_test = BailliePSWTest()
+    print(f"Тест Бейли-ПСВ {num}:", baillie_psw_test.is_prime(num))
+
     key_generator = RSAKeyGenerator(miller_rabin_test, min_probability=0.99, key_length=2048)
     rsa = RSA(key_generator)
 
@@ -0,0 +1,137 @@
+import argparse
+import random
+import time
+
+from RSA import (MOD_POW_BACKENDS, BailliePSWTest, MathService, MillerRabinTest, PrimeGenerator,
+                 RSAKeyGenerator)
+
+
+def measure(function, values: list[int]) -> float:
+    """Количество операций в секунду."""
+    start = time.perf_counter()
+    for value in values:
+        function(value)
+    return len(values) / (time.perf_counter() - start)
+
+
+def bench_crt(bit_lengths: list[int], count: int = 20):
+    """Закрытая операция RSA через КТО (dP, dQ, qInv) против одной экспоненты полной длины."""
+    for bits in bit_lengths:
+        start = time.perf_counter()
+        (e, n), private_key = RSAKeyGenerator(MillerRabinTest(0.99), 0.99, bits).generate_keys()
+        keygen = time.perf_counter() - start
+        values = [pow(random.randrange(n), e, n) for _ in range(count)]
+
+        for c in values[:3]:
+            assert private_key.decrypt(c) == private_key.decrypt_without_crt(c)
+
+        before = measure(private_key.decrypt_without_crt, values)
+        after = measure(private_key.decrypt, values)
+        print(f"RSA-{bits} decrypt: {before:,.1f} оп/с (без КТО) -> {after:,.1f} оп/с (КТО), x{after / before:.1f}; "
+              f"генерация ключа {keygen:,.1f} с")
+
+
+def bench_modexp(bit_lengths: list[int], count: int = 10):
+    """Реализации возведения в степень по длинам модуля; фиксированное основание - против встроенного pow."""
+    for bits in bit_lengths:
+        mod = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        operands = [(random.getrandbits(bits), random.getrandbits(bits)) for _ in range(count)]
+        results = {backend.name: measure(lambda pair: backend.pow(*pair, mod), operands)
+                   for backend in MOD_POW_BACKENDS}
+        line = ', '.join(f"{name} {ops:,.1f}" for name, ops in results.items())
+        print(f"modexp-{bits}: {line} оп/с; быстрее всех {max(results, key=results.get)}")
+
+    for bits in bit_lengths:
+        mod = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        base = random.randrange(mod)
+        exponents = [random.getrandbits(bits) for _ in range(count)]
+        start = time.perf_counter()
+        fixed = MathService.fixed_base(base, mod)
+        build = time.perf_counter() - start
+        assert fixed.pow(exponents[0]) == pow(base, exponents[0], mod)
+
+        before = measure(lambda exponent: pow(base, exponent, mod), exponents)
+        after = measure(fixed.pow, exponents)
+        print(f"fixed-base-{bits}: {before:,.1f} оп/с (pow) -> {after:,.1f} оп/с, x{after / before:.1f}; "
+              f"предвычисление {build * 1000:,.1f} мс (окупается за {build * before:,.1f} возведений)")
+
+
+def naive_prime(bits: int, test) -> int:
+    """Прежний поиск: новое случайное нечётное число и полный is_prime на каждой попытке."""
+    while True:
+        p = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if test.is_prime(p):
+            return p
+
+
+def bench_primes(bit_lengths: list[int], count: int = 3):
+    """Поиск простого: решето окна + основание 2 + раунды по FIPS 186-4 против случайных попыток с is_prime."""
+    test = MillerRabinTest(0.99)
+    generator = PrimeGenerator(test)
+    for bits in bit_lengths:
+        before = measure(lambda _: naive_prime(bits, test), range(count))
+        after = measure(lambda _: generator.generate(bits), range(count))
+        print(f"prime-{bits}: {before:,.2f} простых/с (is_prime, {test.get_iterations(0)} раундов) -> "
+              f"{after:,.2f} простых/с (решето, {PrimeGenerator.miller_rabin_rounds(bits)} раундов), x{after / before:.1f}")
+
+
+def legacy_miller_rabin(n: int, k: int) -> bool:
+    """Прежний MillerRabinTest: разложение n - 1 на каждой итерации, квадрат через mod_pow(x, 2, n)."""
+    for _ in range(k):
+        d, s = n - 1, 0
+        while d % 2 == 0:
+            d //= 2
+            s += 1
+        x = MathService.mod_pow(random.randint(2, n - 2), d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = MathService.mod_pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def bench_primality(bits: int = 1024, count: int = 20000):
+    """Миллер-Рабин: прежний против вынесенного разложения; Бейли-ПСВ; пакетный отсев 64-битных чисел."""
+    test = MillerRabinTest(0.99)
+    k = test.get_iterations(0)
+    prime = PrimeGenerator(test).generate(bits)
+    before = measure(lambda n: legacy_miller_rabin(n, k), [prime] * 3)
+    after = measure(lambda n: test.test_iterations(n, k), [prime] * 3)
+    baillie_psw = measure(BailliePSWTest().is_prime, [prime] * 3)
+    print(f"prime-{bits}, {k} раундов: {before:,.2f} оп/с (прежний) -> {after:,.2f} оп/с, x{after / before:.1f}; "
+          f"Бейли-ПСВ {baillie_psw:,.2f} оп/с")
+
+    numbers = [random.getrandbits(64) | 1 for _ in range(count)]
+    start = time.perf_counter()
+    expected = [n > 1 and legacy_miller_rabin(n, k) for n in numbers]
+    before = count / (time.perf_counter() - start)
+    start = time.perf_counter()
+    assert test.is_prime_many(numbers) == expected
+    after = count / (time.perf_counter() - start)
+    print(f"is_prime_many[64 бит]: {before:,.0f} чисел/с (прежний) -> {after:,.0f} чисел/с, x{after / before:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарки RSA")
+    parser.add_argument('benchmarks', nargs='*', help="crt, modexp, primes, primality (по умолчанию crt)")
+    parser.add_argument('--bits', default='1024,2048,4096', help="длины ключей для crt")
+    parser.add_argument('--prime-bits', default='256,512,1024', help="длины простых для primes")
+    parser.add_argument('--modexp-bits', default='64,256,512,1024,2048,4096', help="длины модуля для modexp")
+    args = parser.parse_args()
+    benchmarks = args.benchmarks or ['crt']
+    unknown = set(benchmarks) - {'crt', 'modexp', 'primes', 'primality'}
+    if unknown:
+        parser.error(f"неизвестные бенчмарки: {', '.join(sorted(unknown))}")
+
+    if 'crt' in benchmarks:
+        bench_crt([int(bits) for bits in args.bits.split(',')])
+    if 'modexp' in benchmarks:
+        bench_modexp([int(bits) for bits in args.modexp_bits.split(',')])
+    if 'primes' in benchmarks:
+        bench_primes([int(bits) for bits in args.prime_bits.split(',')])
+    if 'primality' in benchmarks:
+        bench_primality()
@@ -0,0 +1,131 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import repeat
+
+from RSA import MillerRabinTest, PrimeGenerator, RSAKeyGenerator
+
+# Параллельная генерация ключей RSA в пуле процессов. Один ключ - гонка: все процессы ищут
+# каждое простое от своих случайных начал, первый найденный результат прерывает остальных.
+# Пакет из count ключей - по задаче на ключ, каждая от своего seed, так что набор ключей
+# воспроизводим при заданном rng независимо от числа процессов
+
+# Номер последней завершённой гонки в процессе пула (общая память, передаётся через initializer)
+_FINISHED = None
+
+
+def _init_worker(finished):
+    global _FINISHED
+    _FINISHED = finished
+
+
+class _RaceStop:
+    """Прерывание поиска одной гонки: она завершена, когда счётчик завершённых гонок дошёл до её номера."""
+
+    def __init__(self, race: int):
+        self.race = race
+
+    def is_set(self) -> bool:
+        return _FINISHED.value >= self.race
+
+
+def _search_prime(primality_test, bits: int, seed: int, race: int):
+    """Поиск простого от собственного начального числа; None - гонка race уже выиграна другим процессом."""
+    return PrimeGenerator(primality_test).generate(bits, random.Random(seed), _RaceStop(race))
+
+
+def _search_primes(primality_test, key_length: int, seed: int) -> tuple[int, int]:
+    """Простые p и q одного ключа, определяемые только seed."""
+    rng = random.Random(seed)
+    generator = PrimeGenerator(primality_test)
+    p = generator.generate(key_length // 2, rng)
+    q = generator.generate(key_length // 2, rng)
+    while q == p:
+        q = generator.generate(key_length // 2, rng)
+    return p, q
+
+
+class ParallelRSAKeyGenerator:
+    """
+    Генератор ключей с интерфейсом RSAKeyGenerator (generate_keys), подходит для RSA(key_generator).
+    rng (random.Random) задаёт начальные числа всех поисков: generate_many воспроизводим всегда,
+    generate_keys - только при workers=1 (иначе победитель гонки зависит от планировщика).
+    """
+
+    def __init__(self, primality_test, key_length: int, workers: int = None, rng: random.Random = None):
+        self.primality_test = primality_test
+        self.key_length = key_length
+        self.workers = workers or os.cpu_count()
+        self.rng = rng if rng is not None else random.Random()
+
+    def _executor(self):
+        finished = multiprocessing.RawValue('q', 0)
+        return ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(finished,)), finished
+
+    def _race_prime(self, executor, finished) -> int:
+        """
+        Одно простое: workers поисков параллельно. У каждой гонки свой номер: после первого найденного
+        простого счётчик завершённых гонок сдвигается на него, и проигравшие поиски сами выходят на следующем
+        кандидате - их не ждём, следующая гонка сразу ставится в очередь пула.
+        """
+        race = finished.value + 1
+        futures = [executor.submit(_search_prime, self.primality_test, self.key_length // 2,
+                                   self.rng.getrandbits(64), race)
+                   for _ in range(self.workers)]
+        done, pending = wait(futures, return_when=FIRST_COMPLETED)
+        finished.value = race
+        for future in pending:
+            future.cancel()
+        return next(future.result() for future in done if future.result() is not None)
+
+    def generate_keys(self):
+        executor, finished = self._executor()
+        with executor:
+            p = self._race_prime(executor, finished)
+            q = self._race_prime(executor, finished)
+            while q == p:
+                q = self._race_prime(executor, finished)
+        return RSAKeyGenerator.keys_from_primes(p, q)
+
+    def generate_many(self, count: int, report=print) -> list:
+        """count пар ключей (открытый, закрытый), по задаче на ключ; печатает время каждого ключа и итог в ключах/с."""
+        seeds = [self.rng.getrandbits(64) for _ in range(count)]
+        keys = []
+        start = time.perf_counter()
+        with self._executor()[0] as executor:
+            primes = executor.map(_search_primes, repeat(self.primality_test), repeat(self.key_length), seeds)
+            for p, q in primes:
+                keys.append(RSAKeyGenerator.keys_from_primes(p, q))
+                report(f"ключ {len(keys)}/{count}: {time.perf_counter() - start:,.2f} с")
+        elapsed = time.perf_counter() - start
+        report(f"Итого: {count} ключей RSA-{self.key_length} за {elapsed:,.2f} с, {count / elapsed:,.2f} ключей/с, "
+               f"процессов {self.workers}")
+        return keys
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Параллельная генерация ключей RSA")
+    parser.add_argument('--bits', type=int, default=2048, help="длина модуля n")
+    parser.add_argument('--count', type=int, default=1, help="число пар ключей")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="число процессов")
+    parser.add_argument('--seed', type=int, help="начальное число для воспроизводимой генерации")
+    parser.add_argument('--output', help="файл для ключей (JSON, по строке на ключ)")
+    args = parser.parse_args()
+
+    generator = ParallelRSAKeyGenerator(MillerRabinTest(min_probability=0.99), args.bits, args.workers,
+                                        random.Random(args.seed))
+    if args.count == 1:
+        start = time.perf_counter()
+        keys = [generator.generate_keys()]
+        print(f"Ключ RSA-{args.bits} за {time.perf_counter() - start:,.2f} с, процессов {args.workers}")
+    else:
+        keys = generator.generate_many(args.count)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            for (e, n), private_key in keys:
+                f.write(json.dumps({'n': n, 'e': e, 'd': private_key.d, 'p': private_key.p, 'q': private_key.q}) + '\n')
@@ -1,3 +1,164 @@
+import argparse
+import contextlib
+import hmac
+import logging
+import mmap
+import os
+import sys
+import threading
+import weakref
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from modes import (DEFAULT_CHUNK_SIZE, PADDED_MODES, EncryptionMode, KeyScheduleCache, ModeEngine, StreamDecryptor,
+                   StreamEncryptor, strip_pkcs7)
+
+# Диагностика файлового шифрования выключена по умолчанию, включается настройкой logging (--verbose)
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class GFTables:
+    """Таблицы exp/log/обратных элементов GF(2^8) для одного модуля (только для чтения)."""
+    __slots__ = ('modulus', 'generator', 'exp', 'log', 'inverse', '_product')
+
+    def __init__(self, modulus, generator, exp, log, inverse):
+        self.modulus = modulus
+        self.generator = generator
+        self.exp = exp
+        self.log = log
+        self.inverse = inverse
+        self._product = None
+
+    @property
+    def product(self):
+        """Полная таблица умножения 256x256: product[(a << 8) | b] = a * b (строится при первом обращении)."""
+        if self._product is None:
+            exp, log = self.exp, self.log
+            table = bytearray(1 << 16)
+            for a in range(1, 256):
+                log_a = log[a]
+                row = a << 8
+                for b in range(1, 256):
+                    table[row | b] = exp[log_a + log[b]]
+            self._product = bytes(table)
+        return self._product
+
+    def multiply_row(self, c):
+        """Таблица умножения на константу c: row[x] = c * x."""
+        start = c << 8
+        return self.product[start:start + 256]
+
+
+def _multiply_slow(a, b, modulus):
+    """Умножение сдвигами и сложениями (используется для построения таблиц)."""
+    result = 0
+    while b > 0:
+        if b & 1:
+            result ^= a
+        a <<= 1
+        if a & 0x100:
+            a ^= modulus
+        a &= 0xFF
+        b >>= 1
+    return result
+
+
+def _poly_mod(a, m):
+    """Остаток от деления полиномов над GF(2): биты целого - коэффициенты."""
+    degree = m.bit_length()
+    while a.bit_length() >= degree:
+        a ^= m << (a.bit_length() - degree)
+    return a
+
+
+def _poly_mulmod(a, b, m):
+    """Произведение a * b по модулю m над GF(2) (a уже приведён по модулю m)."""
+    degree = m.bit_length() - 1
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        b >>= 1
+        a <<= 1
+        if a >> degree:
+            a ^= m
+    return result
+
+
+def _poly_gcd(a, b):
+    """НОД полиномов над GF(2)."""
+    while b:
+        a, b = b, _poly_mod(a, b)
+    return a
+
+
+def is_irreducible_polynomial(poly):
+    """
+    Тест Рабина: полином f степени n над GF(2) неприводим, если x^(2^n) = x (mod f)
+    и НОД(f, x^(2^(n/p)) - x) = 1 для каждого простого делителя p числа n.
+    """
+    degree = poly.bit_length() - 1
+    if degree < 1:
+        return False
+    x = _poly_mod(0b10, poly)
+
+    def x_power(k):
+        """x^(2^k) mod f - k возведений в квадрат."""
+        result = x
+        for _ in range(k):
+            result = _poly_mulmod(result, result, poly)
+        return result
+
+    if x_power(degree) != x:
+        return False
+    for p in range(2, degree + 1):
+        if degree % p == 0 and all(p % q for q in range(2, p)):
+            if _poly_gcd(poly, x_power(degree // p) ^ x) != 1:
+                return False
+    return True
+
+
+_IRREDUCIBLE_POLYNOMIALS = None
+
+
+def irreducible_polynomials():
+    """Все 30 неприводимых полиномов степени 8 над GF(2) (0x11B, 0x11D, ...), перебор выполняется один раз."""
+    global _IRREDUCIBLE_POLYNOMIALS
+    if _IRREDUCIBLE_POLYNOMIALS is None:
+        # Неприводимый полином степени > 1 имеет ненулевой свободный член - перебираются только нечётные
+        _IRREDUCIBLE_POLYNOMIALS = tuple(poly for poly in range(0x101, 0x200, 2) if is_irreducible_polynomial(poly))
+    return _IRREDUCIBLE_POLYNOMIALS
+
+
+def gf_tables(modulus):
+    """Таблицы для модуля или None, если мультипликативная группа не циклическая порядка 255 (модуль приводим)."""
+    return GF_REGISTRY.tables(modulus)
+
+
+def _build_gf_tables(modulus):
+    for generator in range(2, 256):
+        exp = [1] * 510
+        value = 1
+        for i in range(1, 255):
+            value = _multiply_slow(value, generator, modulus)
+            if value == 1:
+                break
+            exp[i] = value
+        else:
+            if _multiply_slow(value, generator, modulus) != 1:
+                continue
+            exp[255:510] = exp[:255]
+            log = [0] * 256
+            for i in range(255):
+                log[exp[i]] = i
+            inverse = [0] * 256
+            for a in range(1, 256):
+                inverse[a] = exp[255 - log[a]]
+            return GFTables(modulus, generator, tuple(exp), tuple(log), tuple(inverse))
+    return None
+
+
 class GF256:
     def __init__(self, modulus=0x11B):
         """
@@ -5,123 +166,348 @@ class GF256:
         :param modulus: Модуль (неприводимый полином степени 8).
         """
         self.modulus = modulus
+        self.tables = gf_tables(modulus)
 
     def add(self, a, b):
         """Сложение элементов в GF(2^8) (XOR)."""
         return a ^ b
 
     def multiply(self, a, b):
-        """Умножение элементов в GF(2^8) по заданному модулю."""
-        result = 0
-        while b > 0:
-            if b & 1:
-                result ^= a
-            a <<= 1
-            if a & 0x100:
-                a ^= self.modulus
-            a &= 0xFF
-            b >>= 1
-        return result
+        """Умножение элементов в GF(2^8) по заданному модулю (через таблицы логарифмов)."""
+        if self.tables is None:
+            return _multiply_slow(a, b, self.modulus)
+        if a == 0 or b == 0:
+            return 0
+        return self.tables.exp[self.tables.log[a] + self.tables.log[b]]
 
     def inverse(self, a):
         """Взятие обратного элемента в GF(2^8) по заданному модулю."""
         if a == 0:
             return 0  # Обратный элемент для 0 равен 0
+        if self.tables is not None:
+            return self.tables.inverse[a]
         for i in range(1, 256):
             if self.multiply(a, i) == 1:
                 return i
         raise ValueError("Обратный элемент не найден. Возможно, модуль приводим.")
 
     def is_irreducible(self, poly):
-        """Проверка полинома на неприводимость в GF(2^8)."""
-        if poly == 0:
-            return False
-        for i in range(2, 16):
-            if self.multiply(poly, i) % 256 == 0:
-                return False
-        return True
+        """Проверка неприводимости полинома степени 8 над GF(2) (годится ли он в модули GF(2^8))."""
+        return poly.bit_length() == 9 and is_irreducible_polynomial(poly)
 
     def find_irreducible_polynomials(self):
         """Построение коллекции всех неприводимых полиномов степени 8."""
-        irreducibles = []
-        for poly in range(256):
-            if self.is_irreducible(poly):
-                irreducibles.append(poly)
-        return irreducibles
+        return list(irreducible_polynomials())
+
+
+class SBoxTable:
+    """Неизменяемая пара S-box / обратный S-box для одного модуля GF(2^8)."""
+    __slots__ = ('modulus', 'forward', 'inverse')
+
+    def __init__(self, modulus, forward):
+        forward = bytes(forward)
+        inverse = bytearray(256)
+        for i, value in enumerate(forward):
+            inverse[value] = i
+        if len(set(forward)) != 256:
+            raise ValueError("S-box не является перестановкой. Возможно, модуль приводим.")
+        object.__setattr__(self, 'modulus', modulus)
+        object.__setattr__(self, 'forward', forward)
+        object.__setattr__(self, 'inverse', bytes(inverse))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Таблица S-box неизменяема.")
+
+    def __reduce__(self):
+        # pickle по умолчанию восстанавливает слоты через __setattr__ - собираем заново конструктором
+        return SBoxTable, (self.modulus, self.forward)
+
+    def __getitem__(self, x):
+        return self.forward[x]
+
+    def __len__(self):
+        return 256
+
+    def __repr__(self):
+        return f"SBoxTable(modulus={self.modulus:#x}, forward={self.forward[:4].hex()}..., inverse={self.inverse[:4].hex()}...)"
+
+
+def s_box_table(modulus):
+    return GF_REGISTRY.s_box(modulus)
+
+
+def _affine(b):
+    """Аффинное преобразование S-box Rijndael: b ^ rotl(b,1) ^ rotl(b,2) ^ rotl(b,3) ^ rotl(b,4) ^ 0x63."""
+    result = b
+    for shift in range(1, 5):
+        result ^= ((b << shift) | (b >> (8 - shift))) & 0xFF
+    return result ^ 0x63
+
+
+class TTables:
+    """T-таблицы AES: SubBytes+ShiftRows+MixColumns (Te0-Te3) и обратные (Td0-Td3) для одного модуля."""
+    __slots__ = ('s_box', 'inv_s_box', 'te', 'td')
+
+    def __init__(self, gf, table):
+        s_box, inv_s_box = table.forward, table.inverse
+        te0, td0 = [], []
+        for x in range(256):
+            s = s_box[x]
+            te0.append((gf.multiply(2, s) << 24) | (s << 16) | (s << 8) | gf.multiply(3, s))
+            v = inv_s_box[x]
+            td0.append((gf.multiply(14, v) << 24) | (gf.multiply(9, v) << 16)
+                       | (gf.multiply(13, v) << 8) | gf.multiply(11, v))
+        self.s_box = s_box
+        self.inv_s_box = inv_s_box
+        self.te = _rotations(te0)
+        self.td = _rotations(td0)
+
+    def inv_mix_column(self, word):
+        """InvMixColumns для одного столбца-слова (для ключей эквивалентного обратного шифра)."""
+        s_box = self.s_box
+        td0, td1, td2, td3 = self.td
+        return (td0[s_box[word >> 24]] ^ td1[s_box[(word >> 16) & 0xFF]]
+                ^ td2[s_box[(word >> 8) & 0xFF]] ^ td3[s_box[word & 0xFF]])
+
+
+def _rotations(table):
+    """Таблица и три её циклических сдвига слов вправо на 8, 16 и 24 бита."""
+    tables = [tuple(table)]
+    for _ in range(3):
+        tables.append(tuple(((w >> 8) | (w << 24)) & 0xFFFFFFFF for w in tables[-1]))
+    return tuple(tables)
+
+
+def t_tables(gf):
+    return GF_REGISTRY.t_tables(gf.modulus)
+
+
+class GFRegistry:
+    """
+    Реестр модулей GF(2^8): таблицы exp/log/inverse, S-box и T-таблицы строятся один раз
+    на модуль и разделяются всеми экземплярами GF256/AES (потокобезопасно).
+    """
+
+    def __init__(self):
+        self._tables = {}
+        self._s_boxes = {}
+        self._t_tables = {}
+        self._lock = threading.RLock()
+
+    def _cached(self, cache, modulus, build):
+        value = cache.get(modulus)
+        if value is None and modulus not in cache:
+            with self._lock:
+                if modulus not in cache:
+                    cache[modulus] = build(modulus)
+                value = cache[modulus]
+        return value
+
+    def tables(self, modulus):
+        """Таблицы exp/log/inverse модуля или None для приводимого модуля."""
+        return self._cached(self._tables, modulus, _build_gf_tables)
+
+    def s_box(self, modulus):
+        """S-box и обратный S-box модуля."""
+        return self._cached(self._s_boxes, modulus, self._build_s_box)
+
+    def t_tables(self, modulus):
+        """T-таблицы модуля."""
+        return self._cached(self._t_tables, modulus, lambda m: TTables(GF256(m), self.s_box(m)))
+
+    def _build_s_box(self, modulus):
+        if self.tables(modulus) is None:
+            raise ValueError(f"Модуль {modulus:#x} приводим, S-box не строится.")
+        gf = GF256(modulus)
+        return SBoxTable(modulus, [_affine(gf.inverse(i)) for i in range(256)])
+
+    def precompute(self, moduli=None):
+        """Заранее построить таблицы для модулей (по умолчанию - для всех 30 неприводимых)."""
+        for modulus in irreducible_polynomials() if moduli is None else moduli:
+            self.t_tables(modulus)
+
+    def moduli(self):
+        """Модули, для которых уже построены таблицы."""
+        return tuple(self._tables)
+
+    def __contains__(self, modulus):
+        return modulus in self._t_tables
+
+
+GF_REGISTRY = GFRegistry()
+
+
+# Сдвиги строк ShiftRows в зависимости от числа столбцов Nb
+SHIFT_OFFSETS = {4: (0, 1, 2, 3), 6: (0, 1, 2, 3), 8: (0, 1, 3, 4)}
+
+
+def _calculate_rounds(block_size, key_size):
+    """Количество раундов: Nr = max(Nb, Nk) + 6."""
+    if block_size not in (128, 192, 256):
+        raise ValueError("Неподдерживаемый размер блока.")
+    return max(block_size, key_size) // 32 + 6
+
+
+def _generate_rcon(gf, count):
+    """Константы раундов: x^(i-1) в GF(2^8) по заданному модулю."""
+    rcon = [0x01]
+    while len(rcon) < count:
+        rcon.append(gf.multiply(rcon[-1], 0x02))
+    return tuple(rcon)
+
+
+def _expand_key(key, nb, nk, rounds, s_box, rcon):
+    """Расширение ключа (Nk слов ключа -> Nb * (Nr + 1) слов по 4 байта)."""
+    key_schedule = [tuple(key[4*i:4*i+4]) for i in range(nk)]
+    for i in range(nk, nb * (rounds + 1)):
+        temp = key_schedule[i-1]
+        if i % nk == 0:
+            temp = (s_box[temp[1]] ^ rcon[i//nk - 1], s_box[temp[2]], s_box[temp[3]], s_box[temp[0]])
+        elif nk > 6 and i % nk == 4:
+            temp = tuple(s_box[b] for b in temp)
+        key_schedule.append(tuple(key_schedule[i-nk][j] ^ temp[j] for j in range(4)))
+    return tuple(key_schedule)
+
+
+def _decrypt_key_words(tables, words, nb, rounds):
+    """Ключи эквивалентного обратного шифра: обратный порядок раундов, InvMixColumns для средних раундов."""
+    decrypt_words = []
+    for round in range(rounds, -1, -1):
+        round_words = words[nb*round:nb*(round+1)]
+        if 0 < round < rounds:
+            round_words = [tables.inv_mix_column(word) for word in round_words]
+        decrypt_words.extend(round_words)
+    return tuple(decrypt_words)
+
+
+class AESContext:
+    """
+    Неизменяемый расширенный ключ AES для (key, block_size, modulus): раундовые ключи
+    в виде слов-столбцов и по раундам, индексы столбцов ShiftRows. Разделяется потоками.
+    """
+    __slots__ = ('key', 'block_size', 'modulus', 'rounds', 'nb', 'nk', 'rcon', 'key_schedule', 'round_keys',
+                 'encrypt_keys', 'decrypt_keys', 'encrypt_columns', 'decrypt_columns', '__weakref__')
+
+    def __init__(self, key, block_size=128, modulus=0x11B):
+        key = bytes(key)
+        if len(key) not in (16, 24, 32):
+            raise ValueError("Неподдерживаемый размер ключа.")
+        rounds = _calculate_rounds(block_size, len(key) * 8)
+        nb, nk = block_size // 32, len(key) // 4
+        gf = GF256(modulus)
+        table = s_box_table(modulus)
+        rcon = _generate_rcon(gf, nb * (rounds + 1) // nk)
+        key_schedule = _expand_key(key, nb, nk, rounds, table.forward, rcon)
+        encrypt_keys = tuple(int.from_bytes(bytes(word), 'big') for word in key_schedule)
+        offsets = SHIFT_OFFSETS[nb]
+
+        object.__setattr__(self, 'key', key)
+        object.__setattr__(self, 'block_size', block_size)
+        object.__setattr__(self, 'modulus', modulus)
+        object.__setattr__(self, 'rounds', rounds)
+        object.__setattr__(self, 'nb', nb)
+        object.__setattr__(self, 'nk', nk)
+        object.__setattr__(self, 'rcon', rcon)
+        object.__setattr__(self, 'key_schedule', key_schedule)
+        # Раундовый ключ k - кортеж из Nb слов, нарезается один раз при построении
+        object.__setattr__(self, 'round_keys', tuple(key_schedule[nb*k:nb*(k+1)] for k in range(rounds + 1)))
+        object.__setattr__(self, 'encrypt_keys', encrypt_keys)
+        object.__setattr__(self, 'decrypt_keys', _decrypt_key_words(t_tables(gf), encrypt_keys, nb, rounds))
+        object.__setattr__(self, 'encrypt_columns',
+                           tuple(tuple((c + offset) % nb for offset in offsets) for c in range(nb)))
+        object.__setattr__(self, 'decrypt_columns',
+                           tuple(tuple((c - offset) % nb for offset in offsets) for c in range(nb)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Расширенный ключ неизменяем.")
+
+    def __reduce__(self):
+        # В другом процессе (пул параллельных режимов) ключ расширяется заново через его кэш
+        return aes_context, (self.key, self.block_size, self.modulus)
+
+    def __repr__(self):
+        return f"AESContext(block_size={self.block_size}, key_size={len(self.key) * 8}, modulus={self.modulus:#x})"
+
+
+# Расширенные ключи по (key, block_size, modulus): AES(key) для уже встречавшегося ключа - поиск в кэше
+AES_CONTEXT_CACHE = KeyScheduleCache(lambda parameters: AESContext(*parameters))
+
+
+def aes_context(key, block_size=128, modulus=0x11B):
+    """Расширенный ключ из общего LRU-кэша."""
+    return AES_CONTEXT_CACHE.get((bytes(key), block_size, modulus))
 
 
 class AES:
     def __init__(self, key, block_size=128, modulus=0x11B):
         """
-        Инициализация AES с заданным ключом, размером блока и модулем GF(2^8).
+        Инициализация Rijndael с заданным ключом, размером блока и модулем GF(2^8).
         :param key: Ключ для шифрования (128, 192 или 256 бит).
         :param block_size: Размер блока (128, 192 или 256 бит).
         :param modulus: Модуль для работы в GF(2^8).
         """
+        # Расширение ключа берётся из кэша, таблицы - из реестра модулей
+        self.context = context = aes_context(key, block_size, modulus)
         self.gf = GF256(modulus)
         self.key = key
         self.block_size = block_size
-        self.rounds = self.calculate_rounds(block_size, len(key) * 8)
+        self.rounds = context.rounds
+        self.nb = context.nb
+        self.nk = context.nk
+        self.offsets = SHIFT_OFFSETS[self.nb]
+
+        self.s_box_table = s_box_table(modulus)
+        self.S_BOX = self.s_box_table.forward
+        self.INV_S_BOX = self.s_box_table.inverse
+        self.RCON = context.rcon
+        self.key_schedule = context.key_schedule
 
-        # Генерация S-box и Rcon
-        self.S_BOX = self.generate_s_box()
-        self.RCON = [0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1B, 0x36]
+        # Быстрое ядро: состояние - Nb 32-битных слов-столбцов, раунд - T-таблицы
+        self.tables = t_tables(self.gf)
+        self.encrypt_keys = context.encrypt_keys
+        self.decrypt_keys = context.decrypt_keys
+        self._encrypt_columns = context.encrypt_columns
+        self._decrypt_columns = context.decrypt_columns
 
-        # Расширение ключа
-        self.key_schedule = self.key_expansion(key)
+    def __reduce__(self):
+        """Передача в процессы пула - только параметры: таблицы и расширенный ключ берутся там из кэшей."""
+        return AES, (self.key, self.block_size, self.gf.modulus)
 
     def calculate_rounds(self, block_size, key_size):
         """Вычисление количества раундов в зависимости от размера блока и ключа."""
-        if block_size == 128:
-            return 10 if key_size == 128 else 12 if key_size == 192 else 14
-        elif block_size == 192:
-            return 12 if key_size == 128 else 12 if key_size == 192 else 14
-        elif block_size == 256:
-            return 14 if key_size == 128 else 14 if key_size == 192 else 14
-        else:
-            raise ValueError("Неподдерживаемый размер блока.")
+        return _calculate_rounds(block_size, key_size)
 
     def generate_s_box(self):
-        """Генерация S-box на основе работы в GF(2^8)."""
-        s_box = []
-        for i in range(256):
-            inverse = self.gf.inverse(i) if i != 0 else 0
-            s_box.append(inverse ^ 0x63)
-        return s_box
+        """Генерация S-box на основе работы в GF(2^8) (берётся из общего кэша по модулю)."""
+        return list(s_box_table(self.gf.modulus).forward)
+
+    def generate_rcon(self, count):
+        """Константы раундов: x^(i-1) в GF(2^8) по заданному модулю."""
+        return list(_generate_rcon(self.gf, count))
 
     def key_expansion(self, key):
-        """Расширение ключа."""
-        key_schedule = []
-        for i in range(4):
-            key_schedule.append([key[4*i], key[4*i+1], key[4*i+2], key[4*i+3]])
-
-        for i in range(4, 4 * (self.rounds + 1)):
-            temp = key_schedule[i-1]
-            if i % 4 == 0:
-                temp = [self.S_BOX[temp[1]] ^ self.RCON[i//4 - 1],
-                        self.S_BOX[temp[2]],
-                        self.S_BOX[temp[3]],
-                        self.S_BOX[temp[0]]]
-            key_schedule.append([key_schedule[i-4][j] ^ temp[j] for j in range(4)])
-
-        return key_schedule
+        """Расширение ключа (Nk слов ключа -> Nb * (Nr + 1) слов)."""
+        return [list(word) for word in _expand_key(key, self.nb, len(key) // 4, self.rounds, self.S_BOX, self.RCON)]
+
+    def round_key_words(self):
+        """Раундовые ключи как 32-битные слова-столбцы, раунд k занимает слова nb*k .. nb*k + nb - 1."""
+        return self.encrypt_keys
+
+    def decrypt_key_words(self, words):
+        """Ключи эквивалентного обратного шифра: обратный порядок раундов, InvMixColumns для средних раундов."""
+        return _decrypt_key_words(self.tables, words, self.nb, self.rounds)
 
     def sub_bytes(self, state):
         """Подстановка байтов с использованием S-box."""
-        return [[self.S_BOX[state[r][c]] for c in range(4)] for r in range(4)]
+        return [[self.S_BOX[b] for b in row] for row in state]
 
     def shift_rows(self, state):
         """Сдвиг строк."""
-        return [
-            state[0],
-            [state[1][1], state[1][2], state[1][3], state[1][0]],
-            [state[2][2], state[2][3], state[2][0], state[2][1]],
-            [state[3][3], state[3][0], state[3][1], state[3][2]]
-        ]
+        return [row[offset:] + row[:offset] for row, offset in zip(state, self.offsets)]
 
     def mix_columns(self, state):
         """Перемешивание столбцов."""
-        for c in range(4):
+        for c in range(self.nb):
             s0 = self.gf.multiply(0x02, state[0][c]) ^ self.gf.multiply(0x03, state[1][c]) ^ state[2][c] ^ state[3][c]
             s1 = state[0][c] ^ self.gf.multiply(0x02, state[1][c]) ^ self.gf.multiply(0x03, state[2][c]) ^ state[3][c]
             s2 = state[0][c] ^ state[1][c] ^ self.gf.multiply(0x02, state[2][c]) ^ self.gf.multiply(0x03, state[3][c])
@@ -130,60 +516,169 @@ class AES:
         return state
 
     def add_round_key(self, state, round_key):
-        """Добавление раундового ключа."""
-        return [[state[r][c] ^ round_key[r][c] for c in range(4)] for r in range(4)]
+        """Добавление раундового ключа (round_key - список из Nb слов-столбцов)."""
+        return [[state[r][c] ^ round_key[c][r] for c in range(self.nb)] for r in range(4)]
 
     def encrypt(self, plaintext):
         """Шифрование блока данных."""
-        state = [[plaintext[r + 4*c] for c in range(4)] for r in range(4)]
-        state = self.add_round_key(state, self.key_schedule[:4])
+        if self.nb == 4:
+            return self._encrypt_128(plaintext)
+        return self._encrypt_words(plaintext)
+
+    def decrypt(self, ciphertext):
+        """Дешифрование блока данных."""
+        if self.nb == 4:
+            return self._decrypt_128(ciphertext)
+        return self._decrypt_words(ciphertext)
+
+    def _encrypt_128(self, plaintext):
+        """Шифрование 128-битного блока: четыре слова-столбца, раунды развёрнуты."""
+        te0, te1, te2, te3 = self.tables.te
+        s_box = self.tables.s_box
+        rk = self.encrypt_keys
+        s0 = int.from_bytes(plaintext[0:4], 'big') ^ rk[0]
+        s1 = int.from_bytes(plaintext[4:8], 'big') ^ rk[1]
+        s2 = int.from_bytes(plaintext[8:12], 'big') ^ rk[2]
+        s3 = int.from_bytes(plaintext[12:16], 'big') ^ rk[3]
+
+        for k in range(4, 4 * self.rounds, 4):
+            s0, s1, s2, s3 = (
+                te0[s0 >> 24] ^ te1[(s1 >> 16) & 0xFF] ^ te2[(s2 >> 8) & 0xFF] ^ te3[s3 & 0xFF] ^ rk[k],
+                te0[s1 >> 24] ^ te1[(s2 >> 16) & 0xFF] ^ te2[(s3 >> 8) & 0xFF] ^ te3[s0 & 0xFF] ^ rk[k+1],
+                te0[s2 >> 24] ^ te1[(s3 >> 16) & 0xFF] ^ te2[(s0 >> 8) & 0xFF] ^ te3[s1 & 0xFF] ^ rk[k+2],
+                te0[s3 >> 24] ^ te1[(s0 >> 16) & 0xFF] ^ te2[(s1 >> 8) & 0xFF] ^ te3[s2 & 0xFF] ^ rk[k+3])
+
+        k = 4 * self.rounds
+        s0, s1, s2, s3 = (
+            _sub_word(s_box, s0, s1, s2, s3) ^ rk[k],
+            _sub_word(s_box, s1, s2, s3, s0) ^ rk[k+1],
+            _sub_word(s_box, s2, s3, s0, s1) ^ rk[k+2],
+            _sub_word(s_box, s3, s0, s1, s2) ^ rk[k+3])
+
+        return ((s0 << 96) | (s1 << 64) | (s2 << 32) | s3).to_bytes(16, 'big')
+
+    def _decrypt_128(self, ciphertext):
+        """Дешифрование 128-битного блока (эквивалентный обратный шифр, раунды развёрнуты)."""
+        td0, td1, td2, td3 = self.tables.td
+        inv_s_box = self.tables.inv_s_box
+        dk = self.decrypt_keys
+        s0 = int.from_bytes(ciphertext[0:4], 'big') ^ dk[0]
+        s1 = int.from_bytes(ciphertext[4:8], 'big') ^ dk[1]
+        s2 = int.from_bytes(ciphertext[8:12], 'big') ^ dk[2]
+        s3 = int.from_bytes(ciphertext[12:16], 'big') ^ dk[3]
+
+        for k in range(4, 4 * self.rounds, 4):
+            s0, s1, s2, s3 = (
+                td0[s0 >> 24] ^ td1[(s3 >> 16) & 0xFF] ^ td2[(s2 >> 8) & 0xFF] ^ td3[s1 & 0xFF] ^ dk[k],
+                td0[s1 >> 24] ^ td1[(s0 >> 16) & 0xFF] ^ td2[(s3 >> 8) & 0xFF] ^ td3[s2 & 0xFF] ^ dk[k+1],
+                td0[s2 >> 24] ^ td1[(s1 >> 16) & 0xFF] ^ td2[(s0 >> 8) & 0xFF] ^ td3[s3 & 0xFF] ^ dk[k+2],
+                td0[s3 >> 24] ^ td1[(s2 >> 16) & 0xFF] ^ td2[(s1 >> 8) & 0xFF] ^ td3[s0 & 0xFF] ^ dk[k+3])
+
+        k = 4 * self.rounds
+        s0, s1, s2, s3 = (
+            _sub_word(inv_s_box, s0, s3, s2, s1) ^ dk[k],
+            _sub_word(inv_s_box, s1, s0, s3, s2) ^ dk[k+1],
+            _sub_word(inv_s_box, s2, s1, s0, s3) ^ dk[k+2],
+            _sub_word(inv_s_box, s3, s2, s1, s0) ^ dk[k+3])
+
+        return ((s0 << 96) | (s1 << 64) | (s2 << 32) | s3).to_bytes(16, 'big')
+
+    def _encrypt_words(self, plaintext):
+        """Шифрование блока из Nb = 6 или 8 слов-столбцов."""
+        te0, te1, te2, te3 = self.tables.te
+        s_box = self.tables.s_box
+        rk = self.encrypt_keys
+        n = self.nb
+        columns = self._encrypt_columns
+        state = [int.from_bytes(plaintext[4*c:4*c+4], 'big') ^ rk[c] for c in range(n)]
+
+        for k in range(n, n * self.rounds, n):
+            state = [te0[state[a] >> 24] ^ te1[(state[b] >> 16) & 0xFF] ^ te2[(state[c] >> 8) & 0xFF]
+                     ^ te3[state[d] & 0xFF] ^ rk[k + i] for i, (a, b, c, d) in enumerate(columns)]
+
+        k = n * self.rounds
+        state = [_sub_word(s_box, state[a], state[b], state[c], state[d]) ^ rk[k + i]
+                 for i, (a, b, c, d) in enumerate(columns)]
+        return b''.join(word.to_bytes(4, 'big') for word in state)
+
+    def _decrypt_words(self, ciphertext):
+        """Дешифрование блока из Nb = 6 или 8 слов-столбцов."""
+        td0, td1, td2, td3 = self.tables.td
+        inv_s_box = self.tables.inv_s_box
+        dk = self.decrypt_keys
+        n = self.nb
+        columns = self._decrypt_columns
+        state = [int.from_bytes(ciphertext[4*c:4*c+4], 'big') ^ dk[c] for c in range(n)]
+
+        for k in range(n, n * self.rounds, n):
+            state = [td0[state[a] >> 24] ^ td1[(state[b] >> 16) & 0xFF] ^ td2[(state[c] >> 8) & 0xFF]
+                     ^ td3[state[d] & 0xFF] ^ dk[k + i] for i, (a, b, c, d) in enumerate(columns)]
+
+        k = n * self.rounds
+        state = [_sub_word(inv_s_box, state[a], state[b], state[c], state[d]) ^ dk[k + i]
+                 for i, (a, b, c, d) in enumerate(columns)]
+        return b''.join(word.to_bytes(4, 'big') for word in state)
+
+    # Эталонная реализация на списках 4xNb, оставлена для сверки и бенчмарков
+    def _encrypt_reference(self, plaintext):
+        """Шифрование блока данных."""
+        n = self.nb
+        state = [[plaintext[r + 4*c] for c in range(n)] for r in range(4)]
+        state = self.add_round_key(state, self.context.round_keys[0])
 
         for round in range(1, self.rounds):
             state = self.sub_bytes(state)
             state = self.shift_rows(state)
             state = self.mix_columns(state)
-            state = self.add_round_key(state, self.key_schedule[4*round:4*(round+1)])
+            state = self.add_round_key(state, self.context.round_keys[round])
 
         state = self.sub_bytes(state)
         state = self.shift_rows(state)
-        state = self.add_round_key(state, self.key_schedule[4*self.rounds:4*(self.rounds+1)])
+        state = self.add_round_key(state, self.context.round_keys[self.rounds])
 
-        return bytes([state[r][c] for r in range(4) for c in range(4)])
+        return bytes([state[r][c] for c in range(n) for r in range(4)])
 
-    def decrypt(self, ciphertext):
+    def _decrypt_reference(self, ciphertext):
         """Дешифрование блока данных."""
-        state = [[ciphertext[r + 4*c] for c in range(4)] for r in range(4)]
-        state = self.add_round_key(state, self.key_schedule[4*self.rounds:4*(self.rounds+1)])
+        n = self.nb
+        state = [[ciphertext[r + 4*c] for c in range(n)] for r in range(4)]
+        state = self.add_round_key(state, self.context.round_keys[self.rounds])
 
         for round in range(self.rounds-1, 0, -1):
             state = self.inv_shift_rows(state)
             state = self.inv_sub_bytes(state)
-            state = self.add_round_key(state, self.key_schedule[4*round:4*(round+1)])
+            state = self.add_round_key(state, self.context.round_keys[round])
             state = self.inv_mix_columns(state)
 
         state = self.inv_shift_rows(state)
         state = self.inv_sub_bytes(state)
-        state = self.add_round_key(state, self.key_schedule[:4])
+        state = self.add_round_key(state, self.context.round_keys[0])
+
+        return bytes([state[r][c] for c in range(n) for r in range(4)])
+
+    def encrypt_block(self, block):
+        """Шифрование одного блока (интерфейс для слоя режимов ModeEngine)."""
+        return self.encrypt(block)
 
-        return bytes([state[r][c] for r in range(4) for c in range(4)])
+    def decrypt_block(self, block):
+        """Дешифрование одного блока (интерфейс для слоя режимов ModeEngine)."""
+        return self.decrypt(block)
+
+    def modes(self, workers=1):
+        """Режимы шифрования (ECB, CBC, CFB, OFB, CTR) поверх AES."""
+        return ModeEngine(self, self.block_size // 8, workers=workers)
 
     def inv_shift_rows(self, state):
         """Обратный сдвиг строк."""
-        return [
-            state[0],
-            [state[1][3], state[1][0], state[1][1], state[1][2]],
-            [state[2][2], state[2][3], state[2][0], state[2][1]],
-            [state[3][1], state[3][2], state[3][3], state[3][0]]
-        ]
+        return [row[-offset:] + row[:-offset] if offset else row for row, offset in zip(state, self.offsets)]
 
     def inv_sub_bytes(self, state):
         """Обратная подстановка байтов с использованием S-box."""
-        inv_s_box = [self.gf.inverse(self.S_BOX[i]) for i in range(256)]
-        return [[inv_s_box[state[r][c]] for c in range(4)] for r in range(4)]
+        return [[self.INV_S_BOX[b] for b in row] for row in state]
 
     def inv_mix_columns(self, state):
         """Обратное перемешивание столбцов."""
-        for c in range(4):
+        for c in range(self.nb):
             s0 = self.gf.multiply(0x0E, state[0][c]) ^ self.gf.multiply(0x0B, state[1][c]) ^ self.gf.multiply(0x0D, state[2][c]) ^ self.gf.multiply(0x09, state[3][c])
             s1 = self.gf.multiply(0x09, state[0][c]) ^ self.gf.multiply(0x0E, state[1][c]) ^ self.gf.multiply(0x0B, state[2][c]) ^ self.gf.multiply(0x0D, state[3][c])
             s2 = self.gf.multiply(0x0D, state[0][c]) ^ self.gf.multiply(0x09, state[1][c]) ^ self.gf.multiply(0x0E, state[2][c]) ^ self.gf.multiply(0x0B, state[3][c])
@@ -192,64 +687,388 @@ class AES:
         return state
 
 
+def _sub_word(s_box, a, b, c, d):
+    """Слово из S(старший байт a), S(байт 2 b), S(байт 1 c), S(младший байт d) - SubBytes+ShiftRows последнего раунда."""
+    return ((s_box[a >> 24] << 24) | (s_box[(b >> 16) & 0xFF] << 16)
+            | (s_box[(c >> 8) & 0xFF] << 8) | s_box[d & 0xFF])
+
+
 def pad(data, block_size):
     """Добавление PKCS7-заполнения."""
     padding_length = block_size - (len(data) % block_size)
     padding = bytes([padding_length] * padding_length)
     return data + padding
 
-def unpad(data):
-    """Удаление PKCS7-заполнения."""
-    if len(data) == 0:
-        return data  # Если данные пустые, возвращаем их как есть
-    padding_length = data[-1]
-    if padding_length == 0 or padding_length > len(data):
-        return data  # Если заполнение некорректно, возвращаем данные как есть
-    for i in range(1, padding_length + 1):
-        if data[-i] != padding_length:
-            return data  # Если заполнение некорректно, возвращаем данные как есть
-    return data[:-padding_length]
-
-def encrypt_file(aes, input_file, output_file):
-    """Шифрование файла с использованием PKCS7-заполнения."""
-    with open(input_file, 'rb') as f:
-        data = f.read()
-    print(f"Исходные данные: {data}")  # Отладочное сообщение
-    # Добавляем заполнение
-    padded_data = pad(data, 16)
-    print(f"Заполненные данные: {padded_data}")  # Отладочное сообщение
-    encrypted_data = b""
-    for i in range(0, len(padded_data), 16):
-        block = padded_data[i:i+16]
-        encrypted_data += aes.encrypt(block)
-    print(f"Зашифрованные данные: {encrypted_data}")  # Отладочное сообщение
-    with open(output_file, 'wb') as f:
-        f.write(encrypted_data)
-
-def decrypt_file(aes, input_file, output_file):
-    """Дешифрование файла с удалением PKCS7-заполнения."""
-    with open(input_file, 'rb') as f:
-        data = f.read()
-    print(f"Зашифрованные данные: {data}")  # Отладочное сообщение
-    decrypted_data = b""
-    for i in range(0, len(data), 16):
-        block = data[i:i+16]
-        decrypted_data += aes.decrypt(block)
-    print(f"Расшифрованные данные: {decrypted_data}")  # Отладочное сообщение
-    # Удаляем заполнение
-    unpadded_data = unpad(decrypted_data)
-    print(f"Расшифрованные данные без заполнения: {unpadded_data}")  # Отладочное сообщение
-    with open(output_file, 'wb') as f:
-        f.write(unpadded_data)
+def unpad(data, block_size):
+    """Удаление PKCS7-заполнения с последнего блока; некорректное заполнение - ValueError."""
+    return strip_pkcs7(data, block_size)
+
+@contextlib.contextmanager
+def _open_source(source):
+    """Источник для чтения: '-' - stdin, путь - файл (отображается в память через mmap), иначе файловый объект."""
+    if source == '-':
+        yield sys.stdin.buffer
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield f
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    yield mapped
+    else:
+        yield source
+
+
+@contextlib.contextmanager
+def _open_target(target):
+    """Приёмник для записи: '-' - stdout, путь - файл, иначе файловый объект."""
+    if target == '-':
+        yield sys.stdout.buffer
+        sys.stdout.buffer.flush()
+    elif isinstance(target, (str, os.PathLike)):
+        with open(target, 'wb') as f:
+            yield f
+    else:
+        yield target
+
+
+def _chunks(source, chunk_size):
+    """Порции входа с признаком последней (чтение на одну порцию вперёд)."""
+    chunk = source.read(chunk_size)
+    while True:
+        following = source.read(chunk_size) if chunk else b''
+        yield chunk, not following
+        if not following:
+            return
+        chunk = following
+
+
+def _chunk_size(aes, chunk_size):
+    """Размер порции, кратный размеру блока."""
+    block_size = aes.block_size // 8
+    return max(chunk_size // block_size, 1) * block_size
+
+
+def encrypt_file(aes, input_file, output_file, mode=EncryptionMode.ECB, iv=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Потоковое шифрование файла (ECB/CBC - с PKCS7-заполнением последней порции); память не зависит от размера."""
+    block_size = aes.block_size // 8
+    padded = mode in PADDED_MODES
+    stream = StreamEncryptor(aes.modes(), mode, iv)
+    total = 0
+    with _open_source(input_file) as source, _open_target(output_file) as target:
+        for chunk, last in _chunks(source, _chunk_size(aes, chunk_size)):
+            total += len(chunk)
+            if last and padded:
+                chunk = pad(chunk, block_size)
+            target.write(stream.update(chunk))
+        output = stream.finalize()
+        # Без заполнения хвост шифруется дополненным нулями блоком, лишние байты гаммы отбрасываются
+        target.write(output if padded else output[:total % block_size])
+    logger.debug("Зашифровано %d байт (%s)", total, mode.name)
+
+
+def decrypt_file(aes, input_file, output_file, mode=EncryptionMode.ECB, iv=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Потоковое дешифрование файла; в ECB/CBC PKCS7-заполнение снимается с последнего блока.
+    При некорректном заполнении выходной файл (если задан путём) удаляется и возбуждается ValueError.
+    """
+    block_size = aes.block_size // 8
+    padded = mode in PADDED_MODES
+    stream = StreamDecryptor(aes.modes(), mode, iv)
+    held = b''
+    total = 0
+    try:
+        with _open_source(input_file) as source, _open_target(output_file) as target:
+            for chunk, last in _chunks(source, _chunk_size(aes, chunk_size)):
+                total += len(chunk)
+                output = stream.update(chunk)
+                if last:
+                    output += stream.finalize()
+                if not padded:
+                    target.write(output)
+                    continue
+                # Последний блок удерживается до конца потока: только в нём может быть заполнение
+                output = held + output
+                target.write(output[:-block_size])
+                held = output[-block_size:]
+            if padded:
+                target.write(unpad(held, block_size))
+    except ValueError:
+        if isinstance(output_file, (str, os.PathLike)) and output_file != '-':
+            os.remove(output_file)
+        raise
+    logger.debug("Расшифровано %d байт (%s)", total, mode.name)
+
+
+# GCM: шифрование CTR и аутентификация GHASH над GF(2^128) за один проход по данным
+GCM_TAG_SIZE = 16
+_GCM_R = 0xE1 << 120
+_GHASH_SHIFTS = tuple(range(120, -8, -8))
+
+
+class GHashTable:
+    """Таблицы умножения на H в GF(2^128) (порядок битов GCM): tables[i][b] = (байт b на позиции i) * H."""
+    __slots__ = ('h', 'tables')
+
+    def __init__(self, h):
+        # basis[j] = x^j * H; умножение на x в порядке битов GCM - сдвиг вправо с приведением по R
+        basis = []
+        v = h
+        for _ in range(128):
+            basis.append(v)
+            v = (v >> 1) ^ _GCM_R if v & 1 else v >> 1
+        tables = []
+        for i in range(16):
+            table = [0] * 256
+            for b in range(1, 256):
+                low = b & -b
+                table[b] = table[b ^ low] ^ basis[8 * i + 8 - low.bit_length()]
+            tables.append(tuple(table))
+        object.__setattr__(self, 'h', h)
+        object.__setattr__(self, 'tables', tuple(tables))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Таблицы GHASH неизменяемы.")
+
+    def __reduce__(self):
+        return GHashTable, (self.h,)
+
+    def multiply(self, x):
+        """x * H: шестнадцать выборок из таблиц вместо 128 сдвигов."""
+        result = 0
+        for table, shift in zip(self.tables, _GHASH_SHIFTS):
+            result ^= table[(x >> shift) & 0xFF]
+        return result
+
+
+# Таблицы GHASH привязаны к расширенному ключу и живут не дольше него
+_GHASH_TABLES = weakref.WeakKeyDictionary()
+
+
+def ghash_table(aes):
+    """Таблицы GHASH для ключа экземпляра AES (H = E_K(0^128))."""
+    table = _GHASH_TABLES.get(aes.context)
+    if table is None:
+        table = _GHASH_TABLES[aes.context] = GHashTable(int.from_bytes(aes.encrypt(bytes(16)), 'big'))
+    return table
+
+
+class _GHash:
+    """Инкрементальный GHASH: данные подаются порциями любой длины."""
+
+    def __init__(self, table):
+        self.table = table
+        self.state = 0
+        self._pending = b''
+
+    def update(self, data):
+        data = self._pending + bytes(data)
+        usable = len(data) - len(data) % 16
+        multiply, state = self.table.multiply, self.state
+        for i in range(0, usable, 16):
+            state = multiply(state ^ int.from_bytes(data[i:i+16], 'big'))
+        self.state = state
+        self._pending = data[usable:]
+
+    def pad(self):
+        """Дополнение нулями до границы блока (между AAD и шифртекстом, перед блоком длин)."""
+        if self._pending:
+            self.update(bytes(16 - len(self._pending)))
+
+
+def _gcm_j0(aes, table, iv):
+    """Начальный счётчик J0: IV || 0^31 || 1 для 96-битного IV, иначе GHASH(IV)."""
+    if len(iv) == 12:
+        return (int.from_bytes(iv, 'big') << 32) | 1
+    ghash = _GHash(table)
+    ghash.update(iv)
+    ghash.pad()
+    ghash.update((8 * len(iv)).to_bytes(16, 'big'))
+    return ghash.state
+
+
+def _gcm_keystream(aes, counter, offset, length):
+    """Гамма GCTR длиной length, начиная с байта offset потока; счётчик - inc32 от counter."""
+    prefix, low = counter & ~0xFFFFFFFF, counter & 0xFFFFFFFF
+    first, skip = divmod(offset, 16)
+    blocks = (skip + length + 15) // 16
+    encrypt = aes.encrypt
+    keystream = b''.join(encrypt((prefix | ((low + first + i) & 0xFFFFFFFF)).to_bytes(16, 'big'))
+                         for i in range(blocks))
+    return keystream[skip:skip+length]
+
+
+def _xor(data, keystream):
+    length = len(data)
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(keystream, 'big')).to_bytes(length, 'big')
+
+
+class _GCMStream:
+    def __init__(self, aes, iv, aad=b''):
+        if aes.block_size != 128:
+            raise ValueError("GCM определён только для 128-битного блока.")
+        if not iv:
+            raise ValueError("Вектор инициализации GCM не может быть пустым.")
+        self.aes = aes
+        table = ghash_table(aes)
+        j0 = _gcm_j0(aes, table, iv)
+        self._tag_mask = int.from_bytes(aes.encrypt(j0.to_bytes(16, 'big')), 'big')
+        self._counter = (j0 & ~0xFFFFFFFF) | ((j0 + 1) & 0xFFFFFFFF)
+        self._ghash = _GHash(table)
+        self._ghash.update(aad)
+        self._ghash.pad()
+        self._aad_length = len(aad)
+        self._length = 0
+        self._finalized = False
+
+    def _crypt(self, data):
+        if self._finalized:
+            raise ValueError("Поток уже завершён.")
+        result = _xor(data, _gcm_keystream(self.aes, self._counter, self._length, len(data)))
+        self._length += len(data)
+        return result
+
+    def _tag(self):
+        self._finalized = True
+        self._ghash.pad()
+        self._ghash.update(((8 * self._aad_length) << 64 | (8 * self._length)).to_bytes(16, 'big'))
+        return (self._ghash.state ^ self._tag_mask).to_bytes(GCM_TAG_SIZE, 'big')
+
+
+class GCMEncryptor(_GCMStream):
+    """Потоковое шифрование AES-GCM: update() возвращает шифртекст, finalize() - тег аутентификации."""
+
+    def update(self, data):
+        ciphertext = self._crypt(data)
+        self._ghash.update(ciphertext)
+        return ciphertext
+
+    def finalize(self):
+        return self._tag()
+
+
+class GCMDecryptor(_GCMStream):
+    """Потоковое дешифрование AES-GCM; открытый текст считается подлинным только после finalize(tag)."""
+
+    def update(self, data):
+        self._ghash.update(data)
+        return self._crypt(data)
+
+    def finalize(self, tag):
+        if not hmac.compare_digest(self._tag(), bytes(tag)):
+            raise ValueError("Ошибка аутентификации: тег GCM не совпадает.")
+
+
+def gcm_encrypt(aes, iv, plaintext, aad=b''):
+    """Шифрование AES-GCM, возвращает (шифртекст, тег)."""
+    stream = GCMEncryptor(aes, iv, aad)
+    ciphertext = stream.update(plaintext)
+    return ciphertext, stream.finalize()
+
+
+def gcm_decrypt(aes, iv, ciphertext, tag, aad=b''):
+    """Дешифрование AES-GCM с проверкой тега (ValueError при несовпадении)."""
+    stream = GCMDecryptor(aes, iv, aad)
+    plaintext = stream.update(ciphertext)
+    stream.finalize(tag)
+    return plaintext
+
+
+def gcm_crypt_range(aes, iv, data, offset):
+    """Шифрование/дешифрование произвольного фрагмента потока GCM с байта offset (без проверки тега)."""
+    if aes.block_size != 128:
+        raise ValueError("GCM определён только для 128-битного блока.")
+    j0 = _gcm_j0(aes, ghash_table(aes), iv)
+    counter = (j0 & ~0xFFFFFFFF) | ((j0 + 1) & 0xFFFFFFFF)
+    return _xor(data, _gcm_keystream(aes, counter, offset, len(data)))
+
+
+def encrypt_file_gcm(aes, input_file, output_file, iv, aad=b'', chunk_size=DEFAULT_CHUNK_SIZE):
+    """Шифрование файла AES-GCM за один проход: шифртекст, затем 16-байтный тег."""
+    stream = GCMEncryptor(aes, iv, aad)
+    total = 0
+    with _open_source(input_file) as source, _open_target(output_file) as target:
+        for chunk, _ in _chunks(source, chunk_size):
+            total += len(chunk)
+            target.write(stream.update(chunk))
+        target.write(stream.finalize())
+    logger.debug("Зашифровано %d байт (GCM)", total)
+
+
+def decrypt_file_gcm(aes, input_file, output_file, iv, aad=b'', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Дешифрование файла AES-GCM за один проход. Открытый текст пишется по мере чтения;
+    при несовпадении тега выходной файл (если задан путём) удаляется и возбуждается ValueError.
+    """
+    stream = GCMDecryptor(aes, iv, aad)
+    held = b''
+    total = 0
+    try:
+        with _open_source(input_file) as source, _open_target(output_file) as target:
+            for chunk, _ in _chunks(source, chunk_size):
+                # Последние 16 байт потока - тег, они удерживаются до конца
+                data = held + chunk
+                held = data[-GCM_TAG_SIZE:]
+                data = data[:-GCM_TAG_SIZE]
+                total += len(data)
+                target.write(stream.update(data))
+            if len(held) < GCM_TAG_SIZE:
+                raise ValueError("Шифртекст GCM короче тега.")
+            stream.finalize(held)
+    except ValueError:
+        if isinstance(output_file, (str, os.PathLike)) and output_file != '-':
+            os.remove(output_file)
+        raise
+    logger.debug("Расшифровано и проверено %d байт (GCM)", total)
 
 
 # Пример использования
 if __name__ == "__main__":
-    key = b"1234567890abcdef"
-    aes = AES(key, block_size=128)
+    parser = argparse.ArgumentParser(description="Потоковое шифрование файлов AES (Rijndael)")
+    parser.add_argument('command', nargs='?', default='demo', choices=['encrypt', 'decrypt', 'demo'])
+    parser.add_argument('input', nargs='?', default='-', help="входной файл, '-' - stdin")
+    parser.add_argument('output', nargs='?', default='-', help="выходной файл, '-' - stdout")
+    parser.add_argument('--key', default='1234567890abcdef', help="ключ (16, 24 или 32 символа)")
+    parser.add_argument('--block-size', type=int, default=128, choices=[128, 192, 256])
+    parser.add_argument('--mode', default='ECB', choices=[mode.name for mode in EncryptionMode] + ['GCM'])
+    parser.add_argument('--iv', help="вектор инициализации в hex (для режимов кроме ECB)")
+    parser.add_argument('--aad', default='', help="дополнительные аутентифицируемые данные для GCM")
+    parser.add_argument('--verbose', action='store_true', help="диагностические сообщения в stderr")
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+    try:
+        iv = bytes.fromhex(args.iv) if args.iv else None
+    except ValueError:
+        parser.error("--iv должен быть в hex")
+    if args.mode == 'GCM' and not iv:
+        parser.error("для режима GCM нужен --iv (nonce, рекомендуется 12 байт)")
+    if args.mode not in ('ECB', 'GCM') and (iv is None or len(iv) != args.block_size // 8):
+        parser.error(f"для режима {args.mode} нужен --iv длиной {args.block_size // 8} байт")
+    aes = AES(args.key.encode(), block_size=args.block_size)
+
+    if args.mode == 'GCM':
+        def encrypt(input_file, output_file):
+            encrypt_file_gcm(aes, input_file, output_file, iv, args.aad.encode())
+
+        def decrypt(input_file, output_file):
+            decrypt_file_gcm(aes, input_file, output_file, iv, args.aad.encode())
+    else:
+        mode = EncryptionMode[args.mode]
+
+        def encrypt(input_file, output_file):
+            encrypt_file(aes, input_file, output_file, mode, iv)
 
-    # Шифрование и дешифрование файла
-    encrypt_file(aes, "input.txt", "encrypted.txt")
-    decrypt_file(aes, "encrypted.txt", "decrypted.txt")
+        def decrypt(input_file, output_file):
+            decrypt_file(aes, input_file, output_file, mode, iv)
 
-    print("Шифрование и дешифрование завершены.")
\ No newline at end of file
+    if args.command == 'encrypt':
+        encrypt(args.input, args.output)
+    elif args.command == 'decrypt':
+        decrypt(args.input, args.output)
+    else:
+        # Шифрование и дешифрование файла
+        encrypt("input.txt", "encrypted.txt")
+        decrypt("encrypted.txt", "decrypted.txt")
+        print("Шифрование и дешифрование завершены.")
@@ -0,0 +1,183 @@
+import sys
+import weakref
+
+import numpy as np
+
+from Rijndael import AES
+from modes import EncryptionMode
+
+# Векторизованное ядро Rijndael: состояние пакета - массив (Nb, N) слов-столбцов uint32,
+# раунд выполняется выборкой из тех же T-таблиц и S-box, что и в Rijndael.py
+CHUNK_BLOCKS = 1 << 14
+
+# Положение байтов слова (от старшего к младшему) в его представлении uint8
+BYTE_POSITIONS = (3, 2, 1, 0) if sys.byteorder == 'little' else (0, 1, 2, 3)
+
+# Режимы, в которых блоки обрабатываются независимо и допускают пакетную обработку
+BATCH_ENCRYPT_MODES = (EncryptionMode.ECB, EncryptionMode.CTR)
+BATCH_DECRYPT_MODES = (EncryptionMode.ECB, EncryptionMode.CBC, EncryptionMode.CFB, EncryptionMode.CTR)
+
+
+class _Kernel:
+    """Таблицы и раундовые ключи одного направления (шифрование или дешифрование) в виде массивов NumPy."""
+    __slots__ = ('t0', 't1', 't2', 't3', 's_box', 'keys', 'columns', 'rounds', 'nb')
+
+    def __init__(self, tables, s_box, keys, columns, rounds, nb):
+        self.t0, self.t1, self.t2, self.t3 = (np.array(table, dtype=np.uint32) for table in tables)
+        self.s_box = np.frombuffer(s_box, dtype=np.uint8)
+        self.keys = np.array(keys, dtype=np.uint32).reshape(rounds + 1, nb, 1)
+        # Для каждой позиции байта (0..3) - столбцы-источники после (Inv)ShiftRows
+        self.columns = tuple(np.array([column[j] for column in columns]) for j in range(4))
+        self.rounds = rounds
+        self.nb = nb
+
+
+# Ядра привязаны к неизменяемому расширенному ключу (AESContext) и живут не дольше него
+_KERNELS = weakref.WeakKeyDictionary()
+
+
+def _kernels(aes: AES) -> tuple:
+    """Ядра шифрования и дешифрования для расширенного ключа экземпляра AES."""
+    context = aes.context
+    kernels = _KERNELS.get(context)
+    if kernels is None:
+        tables = aes.tables
+        kernels = _KERNELS[context] = (
+            _Kernel(tables.te, tables.s_box, context.encrypt_keys, context.encrypt_columns, context.rounds, context.nb),
+            _Kernel(tables.td, tables.inv_s_box, context.decrypt_keys, context.decrypt_columns, context.rounds,
+                    context.nb))
+    return kernels
+
+
+def _process_chunk(state: np.ndarray, kernel: _Kernel) -> np.ndarray:
+    t0, t1, t2, t3, s_box = kernel.t0, kernel.t1, kernel.t2, kernel.t3, kernel.s_box
+    c0, c1, c2, c3 = kernel.columns
+    b0, b1, b2, b3 = BYTE_POSITIONS
+    keys = kernel.keys
+    nb, count = state.shape
+
+    # Байты слов берутся через представление uint8 (без сдвигов и масок), ShiftRows - выбором столбцов
+    state = state ^ keys[0]
+    for k in range(1, kernel.rounds):
+        octets = state.view(np.uint8).reshape(nb, count, 4)
+        state = t0.take(octets[c0, :, b0])
+        state ^= t1.take(octets[c1, :, b1])
+        state ^= t2.take(octets[c2, :, b2])
+        state ^= t3.take(octets[c3, :, b3])
+        state ^= keys[k]
+
+    octets = state.view(np.uint8).reshape(nb, count, 4)
+    result = np.empty((nb, count, 4), dtype=np.uint8)
+    result[:, :, b0] = s_box.take(octets[c0, :, b0])
+    result[:, :, b1] = s_box.take(octets[c1, :, b1])
+    result[:, :, b2] = s_box.take(octets[c2, :, b2])
+    result[:, :, b3] = s_box.take(octets[c3, :, b3])
+    return result.view(np.uint32).reshape(nb, count) ^ keys[kernel.rounds]
+
+
+def aes_process_words(words: np.ndarray, kernel: _Kernel, chunk_blocks: int = CHUNK_BLOCKS) -> np.ndarray:
+    """Обработка массива слов-столбцов uint32 (Nb, N); результат совпадает с AES.encrypt/decrypt для каждого блока."""
+    result = np.empty_like(words)
+    for start in range(0, words.shape[1], chunk_blocks):
+        result[:, start:start+chunk_blocks] = _process_chunk(words[:, start:start+chunk_blocks], kernel)
+    return result
+
+
+def to_words(data, block_size: int) -> np.ndarray:
+    """Байты или массив uint8 (N, block_size) -> слова-столбцы uint32 (Nb, N) (big-endian, как в AES.encrypt)."""
+    if not isinstance(data, np.ndarray):
+        data = np.frombuffer(data, dtype=np.uint8)
+    array = np.ascontiguousarray(data, dtype=np.uint8).reshape(-1)
+    if array.size % block_size:
+        raise ValueError(f"Длина данных должна быть кратна {block_size} байтам.")
+    return np.ascontiguousarray(array.view('>u4').astype(np.uint32).reshape(-1, block_size // 4).T)
+
+
+def from_words(words: np.ndarray) -> np.ndarray:
+    """Слова-столбцы uint32 (Nb, N) -> массив uint8 (N, 4 * Nb)."""
+    return np.ascontiguousarray(words.T).astype('>u4').view(np.uint8).reshape(words.shape[1], 4 * words.shape[0])
+
+
+def aes_encrypt_blocks(aes: AES, blocks) -> np.ndarray:
+    """Пакетное шифрование независимых блоков (ECB): байты или uint8 (N, block_size) -> uint8 (N, block_size)."""
+    size = aes.block_size // 8
+    return from_words(aes_process_words(to_words(blocks, size), _kernels(aes)[0]))
+
+
+def aes_decrypt_blocks(aes: AES, blocks) -> np.ndarray:
+    """Пакетное дешифрование независимых блоков (ECB): байты или uint8 (N, block_size) -> uint8 (N, block_size)."""
+    size = aes.block_size // 8
+    return from_words(aes_process_words(to_words(blocks, size), _kernels(aes)[1]))
+
+
+def _counter_words(iv: bytes, count: int, block_size: int) -> np.ndarray:
+    """Слова-столбцы счётчиков iv, iv + 1, ..., iv + count - 1 (по модулю 2^(8 * block_size))."""
+    nb = block_size // 4
+    start = int.from_bytes(iv, 'big')
+    low_start, high = start & 0xFFFFFFFFFFFFFFFF, start >> 64
+    low = np.uint64(low_start) + np.arange(count, dtype=np.uint64)
+    # Перенос из младших 64 бит происходит не более одного раза на пакет
+    carry = low < np.uint64(low_start)
+    high_mask = (1 << (8 * block_size - 64)) - 1
+    words = np.empty((nb, count), dtype=np.uint32)
+    words[nb - 2] = (low >> np.uint64(32)).astype(np.uint32)
+    words[nb - 1] = (low & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+    for value, selected in ((high, ~carry), ((high + 1) & high_mask, carry)):
+        for i in range(nb - 2):
+            words[i, selected] = (value >> (32 * (nb - 3 - i))) & 0xFFFFFFFF
+    return words
+
+
+def _as_array(data) -> np.ndarray:
+    if isinstance(data, np.ndarray):
+        return np.ascontiguousarray(data, dtype=np.uint8).reshape(-1)
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def _padded(data: np.ndarray, block_size: int) -> np.ndarray:
+    """Данные, дополненные нулями справа до целого числа блоков (как _load_block в modes.py)."""
+    size = (data.size + block_size - 1) // block_size * block_size
+    if size == data.size:
+        return data
+    result = np.zeros(size, dtype=np.uint8)
+    result[:data.size] = data
+    return result
+
+
+def aes_encrypt(aes: AES, data, mode: EncryptionMode = EncryptionMode.ECB, iv: bytes = None) -> bytes:
+    """Пакетное шифрование в режимах ECB и CTR; результат совпадает с aes.modes().encrypt(data, mode, iv)."""
+    if mode not in BATCH_ENCRYPT_MODES:
+        raise ValueError("Пакетное шифрование поддерживается только в режимах ECB и CTR.")
+    size = aes.block_size // 8
+    array = _padded(_as_array(data), size)
+    if mode == EncryptionMode.ECB:
+        return aes_encrypt_blocks(aes, array).tobytes()
+    keystream = from_words(aes_process_words(_counter_words(iv, array.size // size, size), _kernels(aes)[0]))
+    return (array ^ keystream.reshape(-1)).tobytes()
+
+
+def aes_decrypt(aes: AES, data, mode: EncryptionMode = EncryptionMode.ECB, iv: bytes = None) -> bytes:
+    """Пакетное дешифрование в режимах ECB, CBC, CFB и CTR; результат совпадает с aes.modes().decrypt(data, mode, iv)."""
+    if mode not in BATCH_DECRYPT_MODES:
+        raise ValueError("Пакетное дешифрование поддерживается только в режимах ECB, CBC, CFB и CTR.")
+    size = aes.block_size // 8
+    array = _as_array(data)
+    if mode in (EncryptionMode.ECB, EncryptionMode.CBC) and array.size % size:
+        raise ValueError(f"Длина блока данных должна быть {aes.block_size} бит ({size} байт).")
+    if mode == EncryptionMode.ECB:
+        return aes_decrypt_blocks(aes, array).tobytes()
+
+    length = array.size
+    if length == 0:
+        return b''
+    padded = _padded(array, size)
+    if mode == EncryptionMode.CBC:
+        previous = np.concatenate((np.frombuffer(iv, dtype=np.uint8), padded[:-size]))
+        return (aes_decrypt_blocks(aes, padded).reshape(-1) ^ previous).tobytes()
+    if mode == EncryptionMode.CFB:
+        previous = np.concatenate((np.frombuffer(iv, dtype=np.uint8), padded[:-size]))
+        keystream = aes_encrypt_blocks(aes, previous).reshape(-1)
+    else:
+        keystream = from_words(aes_process_words(_counter_words(iv, padded.size // size, size),
+                                                 _kernels(aes)[0])).reshape(-1)
+    return (padded ^ keystream)[:length].tobytes()
@@ -0,0 +1,112 @@
+import argparse
+import os
+import time
+
+from Rijndael import AES, AES_CONTEXT_CACHE, AESContext
+
+
+def measure(function, blocks: list[bytes]) -> float:
+    """Количество обработанных блоков в секунду."""
+    start = time.perf_counter()
+    for block in blocks:
+        function(block)
+    return len(blocks) / (time.perf_counter() - start)
+
+
+def bench_blocks(block_size: int = 128, count: int = 2000):
+    """Сравнение эталонного (списки 4xNb) и табличного (T-таблицы) ядра Rijndael."""
+    aes = AES(os.urandom(block_size // 8), block_size=block_size)
+    blocks = [os.urandom(block_size // 8) for _ in range(count)]
+
+    for block in blocks[:100]:
+        assert aes.encrypt(block) == aes._encrypt_reference(block)
+        assert aes.decrypt(aes.encrypt(block)) == block
+
+    before = measure(aes._encrypt_reference, blocks)
+    after = measure(aes.encrypt, blocks)
+    print(f"AES.encrypt[{block_size}]: {before:,.0f} блоков/с (списки) -> {after:,.0f} блоков/с (T-таблицы), x{after / before:.1f}")
+
+    before = measure(aes._decrypt_reference, blocks)
+    after = measure(aes.decrypt, blocks)
+    print(f"AES.decrypt[{block_size}]: {before:,.0f} блоков/с (списки) -> {after:,.0f} блоков/с (T-таблицы), x{after / before:.1f}")
+
+
+def bench_inverse_s_box(count: int = 300):
+    """Дешифрование с обратным S-box, пересобираемым в каждом inv_sub_bytes (как раньше), и с общей таблицей."""
+    aes = AES(os.urandom(16))
+    blocks = [aes.encrypt(os.urandom(16)) for _ in range(count)]
+    after = measure(aes._decrypt_reference, blocks)
+
+    def inv_sub_bytes_rebuilt(state):
+        inv_s_box = [0] * 256
+        for i in range(256):
+            inv_s_box[aes.S_BOX[i]] = i
+        return [[inv_s_box[state[r][c]] for c in range(4)] for r in range(4)]
+
+    aes.inv_sub_bytes = inv_sub_bytes_rebuilt
+    before = measure(aes._decrypt_reference, blocks)
+    print(f"AES._decrypt_reference: {before:,.0f} блоков/с (обратный S-box в каждом раунде) -> "
+          f"{after:,.0f} блоков/с (SBoxTable), x{after / before:.1f}")
+
+
+def bench_key_schedule(count: int = 2000):
+    """Построение AES(key) без кэша расширенных ключей и с повторяющимся (горячим) ключом."""
+    key = os.urandom(16)
+
+    start = time.perf_counter()
+    for _ in range(count):
+        AESContext(key)
+    cold = count / (time.perf_counter() - start)
+
+    AES_CONTEXT_CACHE.clear()
+    start = time.perf_counter()
+    for _ in range(count):
+        AES(key)
+    hot = count / (time.perf_counter() - start)
+    print(f"AES(key): {cold:,.0f} ключей/с (без кэша) -> {hot:,.0f} ключей/с (кэш), {AES_CONTEXT_CACHE.info()}")
+
+
+def bench_numpy(sizes: list[int]):
+    """Пакетное векторизованное ядро (NumPy) против поблочного слоя режимов aes.modes()."""
+    from aes_numpy import aes_decrypt, aes_encrypt
+    from modes import EncryptionMode
+
+    aes = AES(os.urandom(16))
+    iv = os.urandom(16)
+    sample = os.urandom(1 << 16)
+    start = time.perf_counter()
+    aes.modes().encrypt(sample, EncryptionMode.ECB)
+    serial = len(sample) / (1 << 20) / (time.perf_counter() - start)
+    print(f"aes.modes().encrypt ECB: {serial:,.3f} MB/s")
+
+    cases = [(aes_encrypt, EncryptionMode.ECB), (aes_encrypt, EncryptionMode.CTR),
+             (aes_decrypt, EncryptionMode.ECB), (aes_decrypt, EncryptionMode.CBC),
+             (aes_decrypt, EncryptionMode.CFB), (aes_decrypt, EncryptionMode.CTR)]
+    for size in sizes:
+        data = os.urandom(size)
+        for function, mode in cases:
+            start = time.perf_counter()
+            function(aes, data, mode, iv)
+            rate = size / (1 << 20) / (time.perf_counter() - start)
+            print(f"{function.__name__} {mode.name}, {size / (1 << 20):g} MB: {rate:,.1f} MB/s, x{rate / serial:.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарки AES")
+    parser.add_argument('benchmarks', nargs='*', help="blocks, sbox, keys, numpy (по умолчанию blocks, sbox, keys)")
+    parser.add_argument('--sizes', default='4,64', help="размеры входа для numpy, MB")
+    args = parser.parse_args()
+    benchmarks = args.benchmarks or ['blocks', 'sbox', 'keys']
+    unknown = set(benchmarks) - {'blocks', 'sbox', 'keys', 'numpy'}
+    if unknown:
+        parser.error(f"неизвестные бенчмарки: {', '.join(sorted(unknown))}")
+
+    if 'blocks' in benchmarks:
+        for block_size in (128, 192, 256):
+            bench_blocks(block_size)
+    if 'sbox' in benchmarks:
+        bench_inverse_s_box()
+    if 'keys' in benchmarks:
+        bench_key_schedule()
+    if 'numpy' in benchmarks:
+        bench_numpy([int(size) << 20 for size in args.sizes.split(',')])
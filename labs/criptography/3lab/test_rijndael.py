@@ -0,0 +1,85 @@
+import os
+import pickle
+
+import pytest
+
+from Rijndael import AES, decrypt_file, encrypt_file, ghash_table
+from modes import PARALLEL_THRESHOLD, EncryptionMode, ModeEngine, StreamEncryptor
+
+
+@pytest.mark.parametrize('block_size', [128, 192, 256])
+def test_pickle_round_trip(block_size):
+    aes = AES(os.urandom(16), block_size)
+    block = os.urandom(block_size // 8)
+    for value in (aes.context, aes.s_box_table, ghash_table(aes)):
+        assert type(pickle.loads(pickle.dumps(value))) is type(value)
+    assert pickle.loads(pickle.dumps(aes)).encrypt(block) == aes.encrypt(block)
+
+
+@pytest.mark.parametrize('mode', [EncryptionMode.ECB, EncryptionMode.CBC, EncryptionMode.CFB, EncryptionMode.CTR])
+def test_parallel_modes_match_serial(mode):
+    aes = AES(os.urandom(16))
+    iv = os.urandom(16)
+    data = os.urandom(16 * 1024 + 5)
+    serial = aes.modes()
+    parallel = ModeEngine(aes, 16, workers=2, parallel_threshold=4096)
+
+    encrypted = serial.encrypt(data, mode, iv)
+    assert parallel.encrypt(data, mode, iv) == encrypted
+    assert parallel.decrypt(encrypted, mode, iv) == serial.decrypt(encrypted, mode, iv)
+
+
+def test_parallel_modes_default_threshold():
+    aes = AES(os.urandom(16))
+    data = os.urandom(PARALLEL_THRESHOLD + 16)
+    encrypted = aes.modes(workers=2).encrypt(data, EncryptionMode.ECB)
+    assert encrypted == aes.modes().encrypt(data, EncryptionMode.ECB)
+
+
+@pytest.mark.parametrize('mode', [EncryptionMode.ECB, EncryptionMode.CBC])
+def test_decrypt_file_wrong_key(tmp_path, mode):
+    iv = bytes(range(16))
+    source, encrypted, decrypted = tmp_path / 'plain', tmp_path / 'encrypted', tmp_path / 'decrypted'
+    source.write_bytes(b'Hello, Rijndael!' * 100 + b'tail')
+    encrypt_file(AES(b'0123456789abcdef'), str(source), str(encrypted), mode, iv)
+
+    with pytest.raises(ValueError):
+        decrypt_file(AES(b'fedcba9876543210'), str(encrypted), str(decrypted), mode, iv)
+    assert not decrypted.exists()
+
+
+@pytest.mark.parametrize('cut', [1, 5, 15])
+def test_decrypt_file_truncated(tmp_path, cut):
+    aes = AES(b'0123456789abcdef')
+    iv = bytes(range(16))
+    source, encrypted, decrypted = tmp_path / 'plain', tmp_path / 'encrypted', tmp_path / 'decrypted'
+    source.write_bytes(b'Hello, Rijndael!' * 100 + b'tail')
+    encrypt_file(aes, str(source), str(encrypted), EncryptionMode.CBC, iv)
+    encrypted.write_bytes(encrypted.read_bytes()[:-cut])
+
+    with pytest.raises(ValueError):
+        decrypt_file(aes, str(encrypted), str(decrypted), EncryptionMode.CBC, iv)
+    assert not decrypted.exists()
+
+
+def test_decrypt_file_round_trip(tmp_path):
+    aes = AES(b'0123456789abcdef')
+    iv = bytes(range(16))
+    source, encrypted, decrypted = tmp_path / 'plain', tmp_path / 'encrypted', tmp_path / 'decrypted'
+    for data in (b'', b'x' * 16, b'Hello, Rijndael!' * 100 + b'tail'):
+        source.write_bytes(data)
+        encrypt_file(aes, str(source), str(encrypted), EncryptionMode.CBC, iv)
+        decrypt_file(aes, str(encrypted), str(decrypted), EncryptionMode.CBC, iv)
+        assert decrypted.read_bytes() == data
+
+
+@pytest.mark.parametrize('iv', [None, b'abc', bytes(10), bytes(17)])
+@pytest.mark.parametrize('mode', [EncryptionMode.CBC, EncryptionMode.CFB, EncryptionMode.OFB, EncryptionMode.CTR])
+def test_modes_reject_bad_iv(mode, iv):
+    engine = AES(b'0123456789abcdef').modes()
+    with pytest.raises(ValueError):
+        engine.encrypt(bytes(32), mode, iv)
+    with pytest.raises(ValueError):
+        engine.decrypt(bytes(32), mode, iv)
+    with pytest.raises(ValueError):
+        StreamEncryptor(engine, mode, iv)
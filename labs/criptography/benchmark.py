@@ -0,0 +1,236 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+CRIPTOGRAPHY_DIR = os.path.dirname(os.path.abspath(__file__))
+for lab in ('1lab', '2lab', '3lab'):
+    sys.path.insert(0, os.path.join(CRIPTOGRAPHY_DIR, lab))
+
+from DEAL import DEAL, DES, EncryptionMode
+from RSA import BailliePSWTest, FermatTest, MathService, MillerRabinTest, RSAKeyGenerator, SolovayStrassenTest
+from Rijndael import AES, GF256, gcm_encrypt
+
+# Набор бенчмарков для всех примитивов и режимов: операции/с, MB/s, память,
+# результаты пишутся в JSON и сравниваются с сохранённым эталоном
+BENCHMARKS = {}
+
+# Простое число Мерсенна 2^521 - 1 для тестов простоты
+MERSENNE_521 = (1 << 521) - 1
+
+
+def benchmark(name: str):
+    """Регистрация бенчмарка: функция возвращает (операция, байт на операцию или None)."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def run_case(operation, bytes_per_op, min_time: float, repeat: int = 5) -> dict:
+    """
+    repeat прогонов операции не менее min_time секунд каждый (в результат - медиана, устойчивая к шуму),
+    затем отдельный прогон под tracemalloc.
+    """
+    operation()
+    rates = []
+    for _ in range(repeat):
+        count = 0
+        start = time.perf_counter()
+        while True:
+            operation()
+            count += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        rates.append(count / elapsed)
+    ops_per_sec = statistics.median(rates)
+
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    operation()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    retained = sys.getallocatedblocks() - blocks_before
+
+    result = {'ops_per_sec': ops_per_sec, 'ops_per_sec_best': max(rates), 'peak_bytes': peak,
+              'retained_blocks': retained}
+    if bytes_per_op:
+        result['mb_per_sec'] = ops_per_sec * bytes_per_op / (1 << 20)
+    return result
+
+
+# --- DES / DEAL ---
+for size in (1 << 10, 1 << 16):
+    for mode in EncryptionMode:
+        def setup_des(size=size, mode=mode):
+            des = DES(os.urandom(8))
+            data, iv = os.urandom(size), os.urandom(8)
+            return (lambda: des.encrypt(data, mode, iv)), size
+        benchmark(f"DES.encrypt[{mode.name}, {size}]")(setup_des)
+
+        def setup_deal(size=size, mode=mode):
+            deal = DEAL(os.urandom(16))
+            data, iv = os.urandom(size), os.urandom(16)
+            return (lambda: deal.encrypt(data, mode, iv)), size
+        benchmark(f"DEAL.encrypt[{mode.name}, {size}]")(setup_deal)
+
+
+@benchmark("DES._process")
+def setup_des_process():
+    des = DES(os.urandom(8))
+    block = os.urandom(8)
+    return (lambda: des._process(block, des.round_keys)), 8
+
+
+@benchmark("DES.decrypt[CBC, 65536]")
+def setup_des_decrypt():
+    des = DES(os.urandom(8))
+    iv = os.urandom(8)
+    data = des.encrypt(os.urandom(1 << 16), EncryptionMode.CBC, iv)
+    return (lambda: des.decrypt(data, EncryptionMode.CBC, iv)), len(data)
+
+
+# --- AES / GF(2^8) ---
+@benchmark("AES()")
+def setup_aes_init():
+    key = os.urandom(16)
+    return (lambda: AES(key)), None
+
+
+@benchmark("AES.encrypt")
+def setup_aes_encrypt():
+    aes = AES(os.urandom(16))
+    block = os.urandom(16)
+    return (lambda: aes.encrypt(block)), 16
+
+
+@benchmark("AES.decrypt")
+def setup_aes_decrypt():
+    aes = AES(os.urandom(16))
+    block = os.urandom(16)
+    return (lambda: aes.decrypt(block)), 16
+
+
+@benchmark("AES.modes().encrypt[CTR, 65536]")
+def setup_aes_ctr():
+    engine = AES(os.urandom(16)).modes()
+    data, iv = os.urandom(1 << 16), os.urandom(16)
+    return (lambda: engine.encrypt(data, EncryptionMode.CTR, iv)), len(data)
+
+
+@benchmark("gcm_encrypt[65536]")
+def setup_aes_gcm():
+    aes = AES(os.urandom(16))
+    data, iv = os.urandom(1 << 16), os.urandom(12)
+    return (lambda: gcm_encrypt(aes, iv, data)), len(data)
+
+
+@benchmark("GF256.multiply")
+def setup_gf_multiply():
+    gf = GF256()
+    pairs = [(random.randrange(256), random.randrange(256)) for _ in range(256)]
+    return (lambda: [gf.multiply(a, b) for a, b in pairs]), None
+
+
+@benchmark("GF256.inverse")
+def setup_gf_inverse():
+    gf = GF256()
+    return (lambda: [gf.inverse(a) for a in range(256)]), None
+
+
+# --- RSA ---
+for bits in (512, 1024, 2048):
+    def setup_mod_pow(bits=bits):
+        base, exponent, modulus = (random.getrandbits(bits) for _ in range(3))
+        return (lambda: MathService.mod_pow(base, exponent, modulus | 1)), None
+    benchmark(f"MathService.mod_pow[{bits}]")(setup_mod_pow)
+
+    def setup_fixed_base(bits=bits):
+        modulus = random.getrandbits(bits) | 1
+        fixed = MathService.fixed_base(random.getrandbits(bits), modulus)
+        exponent = random.getrandbits(bits)
+        return (lambda: fixed.pow(exponent)), None
+    benchmark(f"FixedBaseModPow.pow[{bits}]")(setup_fixed_base)
+
+for test_class in (FermatTest, SolovayStrassenTest, MillerRabinTest, BailliePSWTest):
+    def setup_primality(test_class=test_class):
+        test = test_class(min_probability=0.99)
+        return (lambda: test.is_prime(MERSENNE_521)), None
+    benchmark(f"{test_class.__name__}.is_prime[521]")(setup_primality)
+
+for key_length in (256, 512):
+    def setup_keygen(key_length=key_length):
+        generator = RSAKeyGenerator(MillerRabinTest(0.99), 0.99, key_length)
+        return generator.generate_keys, None
+    benchmark(f"RSAKeyGenerator.generate_keys[{key_length}]")(setup_keygen)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Бенчмарки, у которых медиана оп/с упала или пиковая память (tracemalloc) выросла
+    более чем на threshold относительно эталона.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        ratio = result['ops_per_sec'] / reference['ops_per_sec']
+        if ratio < 1 - threshold:
+            regressions.append(f"{name}: {result['ops_per_sec']:,.1f} оп/с против {reference['ops_per_sec']:,.1f} "
+                               f"({(1 - ratio) * 100:.1f}% медленнее)")
+        # Мелкие пики (до 4 KB) не сравниваются: там доминируют служебные выделения интерпретатора
+        peak, reference_peak = result['peak_bytes'], reference.get('peak_bytes')
+        if reference_peak is not None and max(peak, reference_peak) > 4096 and peak > reference_peak * (1 + threshold):
+            regressions.append(f"{name}: пик памяти {peak / 1024:,.1f} KB против {reference_peak / 1024:,.1f} KB "
+                               f"({(peak / max(reference_peak, 1) - 1) * 100:.1f}% больше)")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарки криптографических примитивов и режимов")
+    parser.add_argument('--filter', default='', help="запускать только бенчмарки, содержащие подстроку")
+    parser.add_argument('--min-time', type=float, default=0.2, help="минимальное время одного прогона, с")
+    parser.add_argument('--repeat', type=int, default=5, help="число прогонов (сравнивается медиана)")
+    parser.add_argument('--output', help="файл для записи результатов (JSON)")
+    parser.add_argument('--baseline', help="эталонные результаты (JSON) для сравнения")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="допустимое падение производительности и рост пиковой памяти (доля)")
+    parser.add_argument('--list', action='store_true', help="вывести список бенчмарков")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    if args.list:
+        print('\n'.join(names))
+        sys.exit(0)
+
+    random.seed(0)
+    results = {}
+    for name in names:
+        operation, bytes_per_op = BENCHMARKS[name]()
+        result = run_case(operation, bytes_per_op, args.min_time, args.repeat)
+        results[name] = result
+        throughput = f", {result['mb_per_sec']:,.3f} MB/s" if 'mb_per_sec' in result else ''
+        print(f"{name}: {result['ops_per_sec']:,.1f} оп/с{throughput}, "
+              f"пик {result['peak_bytes'] / 1024:,.1f} KB, блоков удержано {result['retained_blocks']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'timestamp': time.time(), 'results': results}, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("Регрессии производительности:")
+            print('\n'.join(regressions))
+            sys.exit(1)
+        print("Регрессий относительно эталона нет.")
@@ -0,0 +1,214 @@
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import lru_cache
+
+CRIPTOGRAPHY_DIR = os.path.dirname(os.path.abspath(__file__))
+for lab in ('1lab', '3lab'):
+    sys.path.insert(0, os.path.join(CRIPTOGRAPHY_DIR, lab))
+
+from DEAL import DEAL, DES
+from Rijndael import AES, decrypt_file, decrypt_file_gcm, encrypt_file, encrypt_file_gcm
+from modes import DEFAULT_CHUNK_SIZE, EncryptionMode, decrypt_stream, encrypt_stream
+
+# Шифрование/дешифрование дерева каталогов: файлы обрабатываются пулом процессов (или потоков),
+# каждый файл - потоково порциями chunk_size с чтением следующей порции в фоне.
+# Длина файлов сохраняется: ECB/CBC - заполнение PKCS7, CFB/OFB/CTR - шифртекст той же длины.
+# Вектор инициализации (nonce для GCM) случайный для каждого файла и записывается заголовком в его начало
+
+# Допустимые длины ключа, байт
+CIPHERS = {'DES': (8,), 'DEAL': (16, 24, 32), 'AES': (16, 24, 32)}
+# Размер блока, байт
+BLOCK_SIZES = {'DES': 8, 'DEAL': 16, 'AES': 16}
+GCM_NONCE_SIZE = 12
+PREFETCH_CHUNKS = 2
+
+
+class PrefetchReader:
+    """Файловый объект только для чтения: фоновый поток читает до depth порций вперёд, пока идёт шифрование."""
+
+    def __init__(self, path: str, chunk_size: int, depth: int = PREFETCH_CHUNKS):
+        self._file = open(path, 'rb')
+        self._chunk_size = chunk_size
+        self._queue = queue.Queue(maxsize=depth)
+        self._buffer = bytearray()
+        self._eof = False
+        self._error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._fill, daemon=True)
+        self._thread.start()
+
+    def _fill(self):
+        while not self._stop.is_set():
+            try:
+                chunk = self._file.read(self._chunk_size)
+            except Exception as error:
+                # Ошибка чтения передаётся через очередь и возбуждается в read(), иначе read() ждал бы вечно
+                self._queue.put(error)
+                return
+            self._queue.put(chunk)
+            if not chunk:
+                return
+
+    def read(self, size: int) -> bytes:
+        while len(self._buffer) < size and not self._eof:
+            if self._error is not None:
+                raise self._error
+            chunk = self._queue.get()
+            if isinstance(chunk, Exception):
+                self._error = chunk
+                raise chunk
+            if not chunk:
+                self._eof = True
+            self._buffer += chunk
+        result = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return result
+
+    def close(self):
+        # Освобождаем очередь, чтобы фоновый поток не остался заблокированным на put()
+        self._stop.set()
+        while self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+@lru_cache(maxsize=None)
+def make_cipher(cipher: str, key: bytes):
+    """Шифр строится один раз на процесс пула (расписания ключей дополнительно кэшируются в самих модулях)."""
+    if cipher == 'DES':
+        return DES(key)
+    if cipher == 'DEAL':
+        return DEAL(key)
+    return AES(key)
+
+
+def iv_size(cipher: str, mode: str) -> int:
+    """Длина вектора инициализации в заголовке файла: 0 для ECB, nonce для GCM, иначе размер блока."""
+    if mode == 'ECB':
+        return 0
+    return GCM_NONCE_SIZE if mode == 'GCM' else BLOCK_SIZES[cipher]
+
+
+def process_file(command: str, cipher: str, key: bytes, mode: str, source: str, target: str,
+                 chunk_size: int) -> tuple[str, int, float]:
+    """
+    Шифрование/дешифрование одного файла; возвращает (путь, байт прочитано, секунд).
+    При шифровании в начало файла пишется его случайный IV, при дешифровании он оттуда читается.
+    """
+    start = time.perf_counter()
+    instance = make_cipher(cipher, key)
+    size = iv_size(cipher, mode)
+    os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+    try:
+        with PrefetchReader(source, chunk_size) as reader, open(target, 'wb') as output:
+            if command == 'encrypt':
+                # Один IV для разных файлов под одним ключом раскрывает открытый текст (CTR/OFB/GCM - полностью)
+                iv = os.urandom(size)
+                output.write(iv)
+            else:
+                iv = reader.read(size)
+                if len(iv) < size:
+                    raise ValueError("Файл короче заголовка с вектором инициализации.")
+            iv = iv or None
+            if cipher == 'AES' and mode == 'GCM':
+                function = encrypt_file_gcm if command == 'encrypt' else decrypt_file_gcm
+                function(instance, reader, output, iv, chunk_size=chunk_size)
+            elif cipher == 'AES':
+                function = encrypt_file if command == 'encrypt' else decrypt_file
+                function(instance, reader, output, EncryptionMode[mode], iv, chunk_size)
+            elif command == 'encrypt':
+                encrypt_stream(instance, reader, output, EncryptionMode[mode], iv, chunk_size, pkcs7=True)
+            else:
+                decrypt_stream(instance, reader, output, EncryptionMode[mode], iv, chunk_size, pkcs7=True)
+    except BaseException:
+        # Недописанный (или не прошедший проверку тега GCM) результат не оставляем
+        if os.path.exists(target):
+            os.remove(target)
+        raise
+    return source, os.path.getsize(source), time.perf_counter() - start
+
+
+def walk(source_dir: str, target_dir: str):
+    """Пары (входной файл, выходной файл) с сохранением структуры каталогов."""
+    for root, _, files in os.walk(source_dir):
+        for name in sorted(files):
+            source = os.path.join(root, name)
+            yield source, os.path.join(target_dir, os.path.relpath(source, source_dir))
+
+
+def run(command: str, cipher: str, key: bytes, mode: str, source_dir: str, target_dir: str,
+        workers: int, chunk_size: int = DEFAULT_CHUNK_SIZE, pool: str = 'process', report=print) -> dict:
+    """
+    Обработка каталога пулом из workers исполнителей. В работе одновременно не больше 2 * workers файлов,
+    каждый читается порциями chunk_size, поэтому память ограничена ~workers * chunk_size * (PREFETCH_CHUNKS + 2).
+    """
+    executor_class = ProcessPoolExecutor if pool == 'process' else ThreadPoolExecutor
+    files = total = failed = 0
+    start = time.perf_counter()
+    with executor_class(max_workers=workers) as executor:
+        pending = {}
+
+        def collect(done):
+            nonlocal files, total, failed
+            for future in done:
+                source = pending.pop(future)
+                try:
+                    path, size, elapsed = future.result()
+                except Exception as error:
+                    failed += 1
+                    report(f"{os.path.relpath(source, source_dir)}: ошибка: {type(error).__name__}: {error}")
+                    continue
+                files += 1
+                total += size
+                report(f"{os.path.relpath(path, source_dir)}: {size / (1 << 20):,.2f} MB, "
+                       f"{size / (1 << 20) / elapsed:,.2f} MB/s")
+
+        for source, target in walk(source_dir, target_dir):
+            if len(pending) >= 2 * workers:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+            future = executor.submit(process_file, command, cipher, key, mode, source, target, chunk_size)
+            pending[future] = source
+        collect(wait(pending).done)
+
+    elapsed = time.perf_counter() - start
+    report(f"Итого: {files} файлов, {total / (1 << 20):,.2f} MB за {elapsed:,.2f} с, "
+           f"{total / (1 << 20) / elapsed if elapsed else 0:,.2f} MB/s, ошибок {failed}")
+    return {'files': files, 'bytes': total, 'seconds': elapsed, 'failed': failed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Шифрование и дешифрование каталога (DES, DEAL, AES)")
+    parser.add_argument('command', choices=['encrypt', 'decrypt'])
+    parser.add_argument('source', help="входной каталог")
+    parser.add_argument('target', help="выходной каталог (структура повторяет входную)")
+    parser.add_argument('--cipher', default='AES', choices=list(CIPHERS))
+    parser.add_argument('--key', required=True, help="ключ (DES - 8 символов, DEAL/AES - 16, 24 или 32)")
+    parser.add_argument('--mode', default='CBC', choices=[mode.name for mode in EncryptionMode] + ['GCM'])
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="число исполнителей")
+    parser.add_argument('--pool', default='process', choices=['process', 'thread'])
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="размер порции чтения, байт")
+    args = parser.parse_args()
+
+    key = args.key.encode()
+    if len(key) not in CIPHERS[args.cipher]:
+        parser.error(f"неподходящая длина ключа для {args.cipher}: {len(key)} байт")
+    if args.mode == 'GCM' and args.cipher != 'AES':
+        parser.error("режим GCM доступен только для AES")
+
+    summary = run(args.command, args.cipher, key, args.mode, args.source, args.target,
+                  args.workers, args.chunk_size, args.pool)
+    sys.exit(1 if summary['failed'] else 0)
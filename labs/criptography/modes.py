@@ -0,0 +1,587 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from enum import Enum
+from multiprocessing import shared_memory
+
+# Общий слой режимов шифрования для всех блочных шифров проекта (DES, DEAL, AES)
+
+class EncryptionMode(Enum):
+    ECB = 1
+    CBC = 2
+    CFB = 3
+    OFB = 4
+    CTR = 5
+
+
+# Режимы без зависимости между блоками, которые можно обрабатывать параллельно
+PARALLEL_ENCRYPT_MODES = (EncryptionMode.ECB, EncryptionMode.CTR)
+PARALLEL_DECRYPT_MODES = (EncryptionMode.ECB, EncryptionMode.CBC, EncryptionMode.CFB, EncryptionMode.CTR)
+PARALLEL_THRESHOLD = 1 << 20
+
+# Режимы, в которых шифртекст кратен блоку и для сохранения длины нужно заполнение PKCS7
+PADDED_MODES = (EncryptionMode.ECB, EncryptionMode.CBC)
+
+
+class KeyScheduleCache:
+    """Общий для процесса LRU-кэш расписаний ключей с ограничением размера и счётчиками.
+
+    factory строит неизменяемое расписание по ключу кэша (ключ шифра или кортеж параметров).
+    """
+
+    def __init__(self, factory, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.factory = factory
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            schedule = self._entries.get(key)
+            if schedule is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return schedule
+            self.misses += 1
+
+        schedule = self.factory(key)
+        with self._lock:
+            self._entries[key] = schedule
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return schedule
+
+    def info(self) -> dict:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'size': len(self._entries), 'maxsize': self.maxsize}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class BlockCipher:
+    """Режимы шифрования для блочного шифра с блоком block_size байт.
+
+    Наследник задаёт block_size, _encrypt_block_int/_decrypt_block_int (блок как целое)
+    и _factory() для воссоздания шифра в процессах пула.
+    """
+    block_size = 8
+    workers = 1
+    parallel_threshold = PARALLEL_THRESHOLD
+
+    def _encrypt_block_int(self, block: int) -> int:
+        raise NotImplementedError
+
+    def _decrypt_block_int(self, block: int) -> int:
+        raise NotImplementedError
+
+    def _factory(self) -> tuple:
+        raise NotImplementedError
+
+    def encrypt(self, data: bytes, mode: EncryptionMode = EncryptionMode.ECB, iv: bytes = None,
+                workers: int = None) -> bytes:
+        out = bytearray(self.encrypted_size(len(data)))
+        self.encrypt_into(data, out, mode, iv, workers)
+        return bytes(out)
+
+    def decrypt(self, data: bytes, mode: EncryptionMode = EncryptionMode.ECB, iv: bytes = None,
+                workers: int = None) -> bytes:
+        out = bytearray(self.decrypted_size(len(data), mode))
+        self.decrypt_into(data, out, mode, iv, workers)
+        return bytes(out)
+
+    def encrypted_size(self, length: int) -> int:
+        """Размер шифртекста: данные дополняются нулями до целого числа блоков."""
+        return (length + self.block_size - 1) // self.block_size * self.block_size
+
+    def decrypted_size(self, length: int, mode: EncryptionMode) -> int:
+        if mode in (EncryptionMode.ECB, EncryptionMode.CBC) and length % self.block_size:
+            raise ValueError(f"Длина блока данных должна быть {self.block_size * 8} бит ({self.block_size} байт).")
+        return length
+
+    def encrypt_into(self, data, out, mode: EncryptionMode = EncryptionMode.ECB, iv: bytes = None,
+                     workers: int = None) -> int:
+        """Шифрование data в заранее выделенный буфер out (bytearray/memoryview), возвращает число записанных байт."""
+        self._check_iv(mode, iv)
+        size = self.encrypted_size(len(data))
+        if len(out) < size:
+            raise ValueError("Буфер вывода слишком мал.")
+        workers = self.workers if workers is None else workers
+        if workers > 1 and len(data) >= self.parallel_threshold and mode in PARALLEL_ENCRYPT_MODES:
+            self._run_parallel('_encrypt_' + mode.name.lower(), data, out, size, mode, iv, workers)
+        elif mode == EncryptionMode.ECB:
+            self._encrypt_ecb(data, out)
+        elif mode == EncryptionMode.CBC:
+            self._encrypt_cbc(data, out, iv)
+        elif mode == EncryptionMode.CFB:
+            self._encrypt_cfb(data, out, iv)
+        elif mode == EncryptionMode.OFB:
+            self._encrypt_ofb(data, out, iv)
+        elif mode == EncryptionMode.CTR:
+            self._encrypt_ctr(data, out, iv)
+        else:
+            raise ValueError("Неподдерживаемый режим шифрования.")
+        return size
+
+    def decrypt_into(self, data, out, mode: EncryptionMode = EncryptionMode.ECB, iv: bytes = None,
+                     workers: int = None) -> int:
+        """Дешифрование data в заранее выделенный буфер out, возвращает число записанных байт."""
+        self._check_iv(mode, iv)
+        size = self.decrypted_size(len(data), mode)
+        if len(out) < size:
+            raise ValueError("Буфер вывода слишком мал.")
+        workers = self.workers if workers is None else workers
+        if workers > 1 and len(data) >= self.parallel_threshold and mode in PARALLEL_DECRYPT_MODES:
+            self._run_parallel('_decrypt_' + mode.name.lower(), data, out, size, mode, iv, workers)
+        elif mode == EncryptionMode.ECB:
+            self._decrypt_ecb(data, out)
+        elif mode == EncryptionMode.CBC:
+            self._decrypt_cbc(data, out, iv)
+        elif mode == EncryptionMode.CFB:
+            self._decrypt_cfb(data, out, iv)
+        elif mode == EncryptionMode.OFB:
+            self._decrypt_ofb(data, out, iv)
+        elif mode == EncryptionMode.CTR:
+            self._decrypt_ctr(data, out, iv)
+        else:
+            raise ValueError("Неподдерживаемый режим шифрования.")
+        return size
+
+    def _check_iv(self, mode: EncryptionMode, iv):
+        """Во всех режимах, кроме ECB, нужен вектор инициализации ровно в один блок."""
+        if not isinstance(mode, EncryptionMode) or mode == EncryptionMode.ECB:
+            return
+        if iv is None or len(iv) != self.block_size:
+            raise ValueError(f"Для режима {mode.name} нужен вектор инициализации длиной {self.block_size} байт.")
+
+    def keystream(self, mode: EncryptionMode, iv: bytes) -> 'KeystreamGenerator':
+        return KeystreamGenerator(self, mode, iv)
+
+    def crypt_range(self, data, offset: int, mode: EncryptionMode, iv: bytes) -> bytes:
+        """Шифрование/дешифрование фрагмента потока OFB/CTR, начинающегося с байта offset."""
+        generator = KeystreamGenerator(self, mode, iv)
+        generator.seek(offset)
+        return generator.xor(data)
+
+    def _run_parallel(self, method_name: str, data, out, size: int, mode: EncryptionMode, iv: bytes, workers: int):
+        """Разбиение входа на сегменты по числу процессов, обработка через общую память и сборка на месте."""
+        length = len(data)
+        blocks = (length + self.block_size - 1) // self.block_size
+        step = (blocks + workers - 1) // workers * self.block_size
+        shm_in = shared_memory.SharedMemory(create=True, size=length)
+        shm_out = shared_memory.SharedMemory(create=True, size=size)
+        pool = _get_pool(workers)
+        try:
+            shm_in.buf[:length] = data
+            futures = []
+            for start in range(0, length, step):
+                stop = min(start + step, length)
+                out_stop = min(start + step, size)
+                futures.append(pool.submit(
+                    _process_segment, self._factory(), method_name, shm_in.name, shm_out.name,
+                    start, stop, out_stop, self._segment_iv(mode, data, start, iv)))
+            for future in futures:
+                future.result()
+            out[:size] = shm_out.buf[:size]
+        except BrokenProcessPool:
+            # Сломанный пул (процесс завершился аварийно) не переиспользуется: следующий вызов создаст новый
+            _discard_pool(workers, pool)
+            raise
+        finally:
+            for shm in (shm_in, shm_out):
+                shm.close()
+                shm.unlink()
+
+    def _segment_iv(self, mode: EncryptionMode, data, start: int, iv: bytes):
+        """Вектор инициализации для сегмента, начинающегося со смещения start."""
+        if mode == EncryptionMode.ECB:
+            return None
+        if mode == EncryptionMode.CTR:
+            counter = (int.from_bytes(iv, 'big') + start // self.block_size) & self._block_mask()
+            return counter.to_bytes(self.block_size, 'big')
+        return iv if start == 0 else bytes(data[start-self.block_size:start])
+
+    def _block_mask(self) -> int:
+        return (1 << (8 * self.block_size)) - 1
+
+    # Режимы работают с блоками как с целыми и пишут результат прямо в out;
+    # неполный последний блок при шифровании дополняется нулями справа
+    def _encrypt_ecb(self, data, out):
+        process, size = self._encrypt_block_int, self.block_size
+        for i in range(0, len(data), size):
+            out[i:i+size] = process(_load_block(data, i, size)).to_bytes(size, 'big')
+
+    def _decrypt_ecb(self, data, out):
+        process, size = self._decrypt_block_int, self.block_size
+        for i in range(0, len(data), size):
+            out[i:i+size] = process(int.from_bytes(data[i:i+size], 'big')).to_bytes(size, 'big')
+
+    def _encrypt_cbc(self, data, out, iv: bytes):
+        process, size = self._encrypt_block_int, self.block_size
+        previous_block = int.from_bytes(iv, 'big')
+        for i in range(0, len(data), size):
+            previous_block = process(_load_block(data, i, size) ^ previous_block)
+            out[i:i+size] = previous_block.to_bytes(size, 'big')
+
+    def _decrypt_cbc(self, data, out, iv: bytes):
+        process, size = self._decrypt_block_int, self.block_size
+        previous_block = int.from_bytes(iv, 'big')
+        for i in range(0, len(data), size):
+            block = int.from_bytes(data[i:i+size], 'big')
+            out[i:i+size] = (process(block) ^ previous_block).to_bytes(size, 'big')
+            previous_block = block
+
+    def _encrypt_cfb(self, data, out, iv: bytes):
+        process, size = self._encrypt_block_int, self.block_size
+        previous_block = int.from_bytes(iv, 'big')
+        for i in range(0, len(data), size):
+            previous_block = _load_block(data, i, size) ^ process(previous_block)
+            out[i:i+size] = previous_block.to_bytes(size, 'big')
+
+    def _decrypt_cfb(self, data, out, iv: bytes):
+        process, size = self._encrypt_block_int, self.block_size
+        previous_block = int.from_bytes(iv, 'big')
+        for i in range(0, len(data), size):
+            chunk = data[i:i+size]
+            _store_xor(out, i, chunk, process(previous_block), size)
+            previous_block = int.from_bytes(chunk, 'big')
+
+    def _encrypt_ofb(self, data, out, iv: bytes):
+        process, size = self._encrypt_block_int, self.block_size
+        previous_block = int.from_bytes(iv, 'big')
+        for i in range(0, len(data), size):
+            previous_block = process(previous_block)
+            out[i:i+size] = (_load_block(data, i, size) ^ previous_block).to_bytes(size, 'big')
+
+    def _decrypt_ofb(self, data, out, iv: bytes):
+        process, size = self._encrypt_block_int, self.block_size
+        previous_block = int.from_bytes(iv, 'big')
+        for i in range(0, len(data), size):
+            previous_block = process(previous_block)
+            _store_xor(out, i, data[i:i+size], previous_block, size)
+
+    def _encrypt_ctr(self, data, out, iv: bytes):
+        process, size, mask = self._encrypt_block_int, self.block_size, self._block_mask()
+        counter = int.from_bytes(iv, 'big')
+        for i in range(0, len(data), size):
+            out[i:i+size] = (_load_block(data, i, size) ^ process(counter)).to_bytes(size, 'big')
+            counter = (counter + 1) & mask
+
+    def _decrypt_ctr(self, data, out, iv: bytes):
+        process, size, mask = self._encrypt_block_int, self.block_size, self._block_mask()
+        counter = int.from_bytes(iv, 'big')
+        for i in range(0, len(data), size):
+            _store_xor(out, i, data[i:i+size], process(counter), size)
+            counter = (counter + 1) & mask
+
+    def _xor_bytes(self, a: bytes, b: bytes) -> bytes:
+        return bytes(x ^ y for x, y in zip(a, b))
+
+
+class ModeEngine(BlockCipher):
+    """Режимы шифрования для любого объекта с encrypt_block/decrypt_block над блоками block_size байт."""
+
+    def __init__(self, cipher, block_size: int = None, workers: int = 1,
+                 parallel_threshold: int = PARALLEL_THRESHOLD):
+        self.cipher = cipher
+        self.block_size = cipher.block_size if block_size is None else block_size
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self._encrypt_block = cipher.encrypt_block
+        self._decrypt_block = cipher.decrypt_block
+
+    def _encrypt_block_int(self, block: int) -> int:
+        size = self.block_size
+        return int.from_bytes(self._encrypt_block(block.to_bytes(size, 'big')), 'big')
+
+    def _decrypt_block_int(self, block: int) -> int:
+        size = self.block_size
+        return int.from_bytes(self._decrypt_block(block.to_bytes(size, 'big')), 'big')
+
+    def _factory(self) -> tuple:
+        return ModeEngine, (self.cipher, self.block_size)
+
+
+def _load_block(data, offset: int, size: int = 8) -> int:
+    """Блок данных как целое; неполный блок дополняется нулями справа."""
+    chunk = data[offset:offset+size]
+    block = int.from_bytes(chunk, 'big')
+    if len(chunk) < size:
+        block <<= 8 * (size - len(chunk))
+    return block
+
+def _store_xor(out, offset: int, chunk, keystream: int, size: int = 8):
+    """Запись chunk XOR keystream в out; для неполного блока берутся старшие байты гаммы."""
+    length = len(chunk)
+    value = int.from_bytes(chunk, 'big') ^ (keystream >> (8 * (size - length)))
+    out[offset:offset+length] = value.to_bytes(length, 'big')
+
+# Пул процессов для параллельных режимов, создаётся лениво и переиспользуется
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    with _POOLS_LOCK:
+        pool = _POOLS.get(workers)
+        if pool is None:
+            pool = _POOLS[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+def _discard_pool(workers: int, pool: ProcessPoolExecutor):
+    with _POOLS_LOCK:
+        if _POOLS.get(workers) is pool:
+            del _POOLS[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _process_segment(factory: tuple, method_name: str, in_name: str, out_name: str,
+                     start: int, stop: int, out_stop: int, iv: bytes):
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    data = shm_in.buf[start:stop]
+    out = shm_out.buf[start:out_stop]
+    try:
+        cipher_class, args = factory
+        method = getattr(cipher_class(*args), method_name)
+        if iv is None:
+            method(data, out)
+        else:
+            method(data, out, iv)
+    finally:
+        data.release()
+        out.release()
+        shm_in.close()
+        shm_out.close()
+
+
+# Генератор гаммы для OFB/CTR: гамма вырабатывается пакетами, для CTR доступна
+# перемотка к любому байту за O(1), для OFB перемотка назад пересчитывает гамму с начала
+class KeystreamGenerator:
+    def __init__(self, cipher: BlockCipher, mode: EncryptionMode, iv: bytes, batch_blocks: int = 1024):
+        if mode not in (EncryptionMode.OFB, EncryptionMode.CTR):
+            raise ValueError("Гамма вырабатывается только в режимах OFB и CTR.")
+        cipher._check_iv(mode, iv)
+        self.cipher = cipher
+        self.mode = mode
+        self.iv = int.from_bytes(iv, 'big')
+        self.batch_blocks = batch_blocks
+        self.position = 0
+        self._batch_start = 0
+        self._batch = []
+        self._ofb_index = -1
+        self._ofb_register = self.iv
+
+    def seek(self, offset: int):
+        if offset < 0:
+            raise ValueError("Смещение не может быть отрицательным.")
+        self.position = offset
+
+    def tell(self) -> int:
+        return self.position
+
+    def blocks(self, start: int, count: int) -> list[int]:
+        """Блоки гаммы с номерами start .. start + count - 1 (как целые)."""
+        process = self.cipher._encrypt_block_int
+        if self.mode == EncryptionMode.CTR:
+            first, mask = self.iv + start, self.cipher._block_mask()
+            return [process((first + i) & mask) for i in range(count)]
+
+        if start <= self._ofb_index:
+            self._ofb_index, self._ofb_register = -1, self.iv
+        register = self._ofb_register
+        for _ in range(start - 1 - self._ofb_index):
+            register = process(register)
+        result = []
+        for _ in range(count):
+            register = process(register)
+            result.append(register)
+        self._ofb_index, self._ofb_register = start + count - 1, register
+        return result
+
+    def read(self, length: int) -> bytes:
+        """Следующие length байт гаммы начиная с текущей позиции."""
+        size = self.cipher.block_size
+        out = bytearray(length)
+        written = 0
+        while written < length:
+            index, skip = divmod(self.position, size)
+            if not self._batch_start <= index < self._batch_start + len(self._batch):
+                self._batch_start = index
+                self._batch = self.blocks(index, max(self.batch_blocks, (length - written + skip + size - 1) // size))
+            block = self._batch[index - self._batch_start].to_bytes(size, 'big')
+            take = min(size - skip, length - written)
+            out[written:written+take] = block[skip:skip+take]
+            written += take
+            self.position += take
+        return bytes(out)
+
+    def xor(self, data) -> bytes:
+        """Наложение гаммы с текущей позиции на data (шифрование и дешифрование совпадают)."""
+        keystream = self.read(len(data))
+        return (int.from_bytes(data, 'big') ^ int.from_bytes(keystream, 'big')).to_bytes(len(data), 'big')
+
+
+# Потоковое шифрование: состояние сцепления (IV, счётчик) переносится между вызовами update()
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+class _StreamCipher:
+    def __init__(self, cipher: BlockCipher, mode: EncryptionMode, iv: bytes = None):
+        cipher._check_iv(mode, iv)
+        self.cipher = cipher
+        self.mode = mode
+        self.iv = iv
+        self._pending = bytearray()
+        self._finalized = False
+
+    def update(self, data) -> bytes:
+        """Обработка очередной порции данных (bytes, bytearray или memoryview)."""
+        if self._finalized:
+            raise ValueError("Поток уже завершён.")
+        size = self.cipher.block_size
+        if not self._pending and len(data) % size == 0:
+            return self._process_chunk(bytes(data))
+        self._pending += data
+        usable = len(self._pending) - len(self._pending) % size
+        if usable == 0:
+            return b''
+        chunk = bytes(self._pending[:usable])
+        del self._pending[:usable]
+        return self._process_chunk(chunk)
+
+    def finalize(self) -> bytes:
+        """Обработка остатка (неполного последнего блока) и завершение потока."""
+        if self._finalized:
+            raise ValueError("Поток уже завершён.")
+        self._finalized = True
+        if not self._pending:
+            return b''
+        chunk = bytes(self._pending)
+        self._pending.clear()
+        return self._transform(chunk)
+
+    def _process_chunk(self, chunk: bytes) -> bytes:
+        if not chunk:
+            return b''
+        result = self._transform(chunk)
+        self._advance(chunk, result)
+        return result
+
+    def _advance(self, chunk: bytes, result: bytes):
+        size = self.cipher.block_size
+        if self.mode == EncryptionMode.CTR:
+            counter = int.from_bytes(self.iv, 'big') + len(chunk) // size
+            self.iv = (counter & self.cipher._block_mask()).to_bytes(size, 'big')
+        elif self.mode == EncryptionMode.OFB:
+            self.iv = self.cipher._xor_bytes(chunk[-size:], result[-size:])
+        elif self.mode in (EncryptionMode.CBC, EncryptionMode.CFB):
+            self.iv = self._ciphertext(chunk, result)[-size:]
+
+    def _transform(self, chunk: bytes) -> bytes:
+        raise NotImplementedError
+
+    def _ciphertext(self, chunk: bytes, result: bytes) -> bytes:
+        raise NotImplementedError
+
+
+class StreamEncryptor(_StreamCipher):
+    """Потоковый шифратор для всех режимов EncryptionMode."""
+
+    def _transform(self, chunk: bytes) -> bytes:
+        return self.cipher.encrypt(chunk, self.mode, self.iv)
+
+    def _ciphertext(self, chunk: bytes, result: bytes) -> bytes:
+        return result
+
+
+class StreamDecryptor(_StreamCipher):
+    """Потоковый дешифратор для всех режимов EncryptionMode."""
+
+    def _transform(self, chunk: bytes) -> bytes:
+        return self.cipher.decrypt(chunk, self.mode, self.iv)
+
+    def _ciphertext(self, chunk: bytes, result: bytes) -> bytes:
+        return chunk
+
+
+def _pump(stream: _StreamCipher, source, chunk_size: int):
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        yield stream.update(chunk)
+    yield stream.finalize()
+
+
+def encrypt_stream(cipher: BlockCipher, source, target, mode: EncryptionMode, iv: bytes = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE, pkcs7: bool = False):
+    """Шифрование из файлового объекта (файл, pipe, stdin) в файловый объект блоками по chunk_size байт.
+
+    pkcs7=True сохраняет длину данных: в ECB/CBC последний блок дополняется по PKCS7,
+    в CFB/OFB/CTR шифртекст обрезается до длины открытого текста.
+    """
+    if not pkcs7:
+        for output in _pump(StreamEncryptor(cipher, mode, iv), source, chunk_size):
+            if output:
+                target.write(output)
+        return
+
+    stream = StreamEncryptor(cipher, mode, iv)
+    size = cipher.block_size
+    total = 0
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        total += len(chunk)
+        target.write(stream.update(chunk))
+    if mode in PADDED_MODES:
+        length = size - total % size
+        target.write(stream.update(bytes([length]) * length))
+    target.write(stream.finalize()[:total % size])
+
+
+def decrypt_stream(cipher: BlockCipher, source, target, mode: EncryptionMode, iv: bytes = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE, strip_padding: bool = False, pkcs7: bool = False):
+    """Дешифрование потока; strip_padding отбрасывает нулевое дополнение в конце потока,
+    pkcs7 снимает заполнение PKCS7 (ECB/CBC), записанное encrypt_stream(..., pkcs7=True)."""
+    if pkcs7 and mode in PADDED_MODES:
+        size = cipher.block_size
+        held = b''
+        for output in _pump(StreamDecryptor(cipher, mode, iv), source, chunk_size):
+            # Последний блок удерживается до конца потока: только в нём есть заполнение
+            output = held + output
+            target.write(output[:-size])
+            held = output[-size:]
+        target.write(strip_pkcs7(held, size))
+        return
+
+    held = b''
+    for output in _pump(StreamDecryptor(cipher, mode, iv), source, chunk_size):
+        if not strip_padding:
+            if output:
+                target.write(output)
+            continue
+        stripped = output.rstrip(b'\0')
+        if stripped:
+            target.write(held)
+            target.write(stripped)
+            held = output[len(stripped):]
+        else:
+            held += output
+
+
+def strip_pkcs7(block: bytes, size: int) -> bytes:
+    """Снятие PKCS7-заполнения с последнего блока; некорректное заполнение (неверный ключ или режим,
+    повреждённый или обрезанный шифртекст) - ValueError."""
+    length = block[-1] if len(block) == size else 0
+    if not 0 < length <= size or block[-length:] != bytes([length]) * length:
+        raise ValueError("Некорректное заполнение PKCS7.")
+    return block[:-length]